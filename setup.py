@@ -45,7 +45,8 @@ requirements = [
     "pyyaml>=6.0",
     "cryptography>=38.0.0",
     "python-dotenv>=0.20.0",
-    "python-Levenshtein>=0.20.0"
+    "python-Levenshtein>=0.20.0",
+    "prompt_toolkit>=3.0.0"
 ]
 
 setup(
@@ -79,7 +80,7 @@ setup(
     python_requires=">=3.8",
     entry_points={
         "console_scripts": [
-            "ldapie=ldapie.ldapie:cli",
+            "ldapie=ldapie.__main__:main",
         ],
     },
     # Using entry_points above instead of scripts
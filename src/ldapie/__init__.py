@@ -9,5 +9,13 @@ This is the main package that exports all the necessary modules and defines the
 
 __version__ = "0.1.4"
 
-# Export modules
-from . import help_context, help_overlay, tab_completion, shell_enhancements
+# Export modules; they are imported on first access so that loading the
+# package (e.g. for --version) does not pull in prompt_toolkit and rich.markdown
+_LAZY_SUBMODULES = ("help_context", "help_overlay", "tab_completion", "shell_enhancements")
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Command-line entry point for LDAPie.
+
+Answers --version without importing the CLI module (and with it click,
+rich and ldap3), then hands everything else to the click application.
+"""
+
+import os
+import sys
+
+from . import __version__
+
+
+def main() -> None:
+    """
+    Run the ldapie command line.
+    
+    The bare --version case is answered straight from the package version;
+    a bare --help or no arguments prints the top-level help and --demo runs
+    the bundled demo. Everything else goes through click.
+    """
+    args = sys.argv[1:]
+    
+    if args == ["--version"]:
+        # Same text click.version_option prints, without importing click
+        print(f"ldapie, version {__version__}")
+        return
+    
+    from .ldapie import cli, console, print_help
+    
+    if args in (["--help"], []):
+        print_help()  # Use our custom help formatter for top-level help
+    elif args == ["--demo"]:
+        # Run the demo script
+        try:
+            # Add the parent directory to path for imports if needed
+            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            
+            # Import and run the demo
+            try:
+                from tests.demo import run_demo
+            except ImportError:
+                # Fall back to direct demo import if tests module isn't found
+                current_dir = os.path.dirname(os.path.abspath(__file__))
+                parent_dir = os.path.dirname(os.path.dirname(current_dir))
+                demo_path = os.path.join(parent_dir, 'tests')
+                if os.path.exists(demo_path):
+                    sys.path.insert(0, parent_dir)
+                    from tests.demo import run_demo
+                else:
+                    msg = f"Could not find tests.demo module. Looked in {demo_path}"
+                    raise ImportError(msg) from None  # Using 'from None' to avoid chaining with original exception
+            
+            run_demo()
+        except Exception as e:
+            console.print(f"[error]Error running demo: {e}[/error]")
+            sys.exit(1)
+    else:
+        # Use click's command-line parsing; the CLI function gets its own context
+        cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+In-process result cache for LDAPie.
+
+Holds recent search results so a repeated identical query within one
+session is answered without a server round trip. Entries expire after a
+fixed TTL, the least recently used entry is evicted once the cache is
+full, and writes invalidate every cached search that could contain the
+changed DN. DN parsing is memoized as well, since the same DNs (parents
+especially) are split again and again by the tree and delete code.
+"""
+
+import copy
+import time
+import threading
+from collections import OrderedDict
+from functools import lru_cache, wraps
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from ldap3.utils.dn import to_dn
+
+# Distinct DNs whose parsed RDNs are kept by split_dn
+DN_CACHE_SIZE = 4096
+
+
+class LRUTTLCache:
+    """
+    Bounded mapping whose entries expire after ttl seconds.
+
+    Keys are tuples whose first element is the search base DN, which is
+    what flush() matches against.
+
+    Attributes:
+        maxsize (int): Maximum number of cached results
+        ttl (float): Seconds a result stays valid
+    """
+    def __init__(self, maxsize: int = 128, ttl: float = 300):
+        """
+        Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of cached results
+            ttl: Seconds a result stays valid
+
+        Example:
+            >>> cache = LRUTTLCache(maxsize=64, ttl=60)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, default: Any = None) -> Any:
+        """
+        Return the cached value for key, or default if missing or expired.
+
+        Example:
+            >>> entries = cache.get(("dc=example,dc=com", "(uid=jdoe)"))
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Tuple, value: Any) -> None:
+        """
+        Store value under key, evicting the least recently used entry when full.
+
+        Example:
+            >>> cache.put(("dc=example,dc=com", "(uid=jdoe)"), entries)
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def flush(self, dn: Optional[str] = None) -> None:
+        """
+        Drop cached results that may include dn, or everything without a dn.
+
+        A search is dropped when its base is dn, an ancestor of dn (the entry
+        may be in its result) or a descendant of dn (a subtree delete or
+        rename removes it).
+
+        Example:
+            >>> cache.flush("uid=jdoe,ou=people,dc=example,dc=com")
+        """
+        with self._lock:
+            if dn is None:
+                self._data.clear()
+                return
+            dn = dn.lower()
+            for key in [k for k in self._data if _same_branch(k[0], dn)]:
+                del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _same_branch(base: str, dn: str) -> bool:
+    """Return True when base and the lowercased dn are equal or one contains the other."""
+    base = base.lower()
+    return base == dn or dn.endswith("," + base) or base.endswith("," + dn) or not base
+
+
+def cached(cache: LRUTTLCache, key: Callable[..., Optional[Hashable]]) -> Callable:
+    """
+    Decorator that answers calls from cache when key(*args) was seen before.
+
+    key receives the call's arguments and returns the cache key, or None
+    to bypass the cache for that call. Every call gets its own shallow
+    copy of the result, so a caller sorting or extending it leaves the
+    cached value unchanged.
+
+    Example:
+        >>> @cached(search_cache, key=lambda conn, base, flt: (base, flt))
+        ... def find(conn, base, flt): ...
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            if cache_key is None:
+                return func(*args, **kwargs)
+            result = cache.get(cache_key)
+            if result is None:
+                result = func(*args, **kwargs)
+                cache.put(cache_key, copy.copy(result))
+            else:
+                result = copy.copy(result)
+            return result
+        return wrapper
+    return decorator
+
+
+@lru_cache(maxsize=DN_CACHE_SIZE)
+def split_dn(dn: str) -> Tuple[str, ...]:
+    """
+    Split a DN into its RDNs, honouring escaped commas.
+
+    Results are memoized, so a repeated DN costs a dict lookup instead of
+    a parse; a tuple is returned so callers cannot alter the cached value.
+
+    Example:
+        >>> split_dn("cn=Smith\\, John,ou=people,dc=example,dc=com")
+        ('cn=Smith\\, John', 'ou=people', 'dc=example', 'dc=com')
+    """
+    return tuple(to_dn(dn))
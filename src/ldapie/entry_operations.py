@@ -4,10 +4,45 @@
 LDAP entry manipulation functions (add, modify, delete, rename, compare) for LDAPie.
 """
 
-from typing import Dict, Any, Optional
-from unittest.mock import MagicMock  # For schema simulation
-import ldap3  # Keep ldap3 for Connection type hint and LEVEL constant
+from dataclasses import dataclass
+from itertools import groupby
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import ldap3  # Keep ldap3 for Connection type hint and SUBTREE constant
 from ldap3 import Connection  # Explicitly import Connection for type hinting
+from ldap3.core.exceptions import LDAPUnavailableCriticalExtensionResult
+
+from .cache import split_dn
+from .search import iter_paged_search, search_cache
+
+# Page size for the subtree search behind a recursive delete
+DELETE_PAGE_SIZE = 1000
+
+# Tree Delete control: the server removes the entry and its whole subtree
+TREE_DELETE_OID = '1.2.840.113556.1.4.805'
+TREE_DELETE_CONTROL = (TREE_DELETE_OID, True, None)
+
+# Result code for a critical control the server does not support
+UNAVAILABLE_CRITICAL_EXTENSION = 12
+
+# Defaults for the REUSABLE connection pool used by bulk operations
+POOL_SIZE = 10
+POOL_LIFETIME = 300
+
+
+def get_pool(server: ldap3.Server, user: Optional[str] = None, password: Optional[str] = None,
+             pool_size: int = POOL_SIZE) -> Connection:
+    """
+    Creates a REUSABLE connection pool for issuing many operations concurrently.
+
+    Each operation returns a message id immediately and is sent on one of
+    pool_size sockets; collect its outcome with strategy.get_response(). The pool
+    binds lazily and should be released with unbind(). ldap3 shares started
+    pools by name, so the name carries the server and bind DN; a pool for
+    another server or user is never handed back in its place.
+    """
+    return Connection(server, user=user, password=password,
+                      client_strategy=ldap3.REUSABLE, pool_size=pool_size,
+                      pool_name=f"ldapie-{server.name}-{user}", pool_lifetime=POOL_LIFETIME)
 
 
 def add_entry(connection: Connection, dn: str, attributes: Dict[str, Any], controls=None) -> bool:
@@ -16,6 +51,7 @@ def add_entry(connection: Connection, dn: str, attributes: Dict[str, Any], contr
     attrs_for_add = {k: v for k, v in attributes.items() if k != "objectClass"}
 
     if connection.add(dn, object_classes, attrs_for_add, controls=controls):
+        search_cache.flush(dn)
         return True
 
     error_message = (connection.result.get('description', 'Unknown error')
@@ -23,20 +59,119 @@ def add_entry(connection: Connection, dn: str, attributes: Dict[str, Any], contr
     raise RuntimeError(f"LDAP Add operation failed for {dn}: {error_message}")
 
 
-def delete_entry(connection: Connection, entry_dn: str, recursive: bool = False, controls=None) -> bool:
-    """Deletes an LDAP entry. Can recursively delete child entries."""
-    if recursive:
-        connection.search(search_base=entry_dn,
-                          search_filter='(objectClass=*)',
-                          search_scope=ldap3.LEVEL,  # Direct children
-                          attributes=['objectClass'],  # Minimal attributes
-                          controls=controls)
+def delete_entry(connection: Connection, entry_dn: str, recursive: bool = False, controls=None,
+                 pool: Optional[Connection] = None, server_side: bool = False,
+                 max_depth: Optional[int] = None,
+                 pool_factory: Optional[Callable[[], Connection]] = None) -> bool:
+    """
+    Deletes an LDAP entry. Can recursively delete child entries.
+
+    With server_side, a recursive delete is first sent as a single request
+    carrying the Tree Delete control; servers without the control fall back
+    to deleting the subtree entry by entry. When a pool from get_pool() is
+    given, those deletes are sent through it, overlapping all entries at the
+    same depth; pool_factory (e.g. lambda: get_pool(server, user, password))
+    instead creates such a pool only once an entry-by-entry delete has
+    descendants to remove, and unbinds it afterwards. max_depth limits a recursive delete to entries at most that
+    many levels below entry_dn (1 = direct children); anything deeper is left
+    in place, so the delete fails if such entries exist.
+    """
+    try:
+        if (recursive and server_side and max_depth is None
+                and _tree_delete(connection, entry_dn, controls)):
+            return True
+        return _delete_tree(connection, entry_dn, recursive, controls, pool, max_depth,
+                            pool_factory)
+    finally:
+        # Also runs after a partial failure, when some entries are already gone
+        search_cache.flush(entry_dn)
+
+
+def _tree_delete(connection: Connection, entry_dn: str, controls=None) -> bool:
+    """
+    Deletes entry_dn and its subtree with the Tree Delete control.
+
+    Returns False without deleting anything when the server does not support
+    the control, and raises RuntimeError for any other failure.
+    """
+    # ldap3 lists supported controls as (oid, kind, name, origin) tuples
+    info = connection.server.info
+    if info is not None and not any(control[0] == TREE_DELETE_OID
+                                    for control in info.supported_controls or ()):
+        return False  # Known from the root DSE, so skip the round trip
+
+    try:
+        if connection.delete(entry_dn, controls=[TREE_DELETE_CONTROL, *(controls or [])]):
+            return True
+    except LDAPUnavailableCriticalExtensionResult:
+        return False
+
+    if connection.result and connection.result.get('result') == UNAVAILABLE_CRITICAL_EXTENSION:
+        return False
+    error_message = (connection.result.get('description', 'Unknown error')
+                    if connection.result else 'Unknown error')
+    raise RuntimeError(f"LDAP Delete operation failed for {entry_dn}: {error_message}")
+
+
+def _delete_tree(connection: Connection, entry_dn: str, recursive: bool, controls,
+                 pool: Optional[Connection], max_depth: Optional[int] = None,
+                 pool_factory: Optional[Callable[[], Connection]] = None) -> bool:
+    """Deletes entry_dn, and first its descendants (up to max_depth levels) when recursive."""
+    if recursive and max_depth != 0:
+        # One paged search finds every descendant; '1.1' requests no attributes.
+        # Direct children only need a one-level search.
+        scope = ldap3.LEVEL if max_depth == 1 else ldap3.SUBTREE
+        base_depth = len(split_dn(entry_dn))
+        depth_limit = base_depth + max_depth if max_depth is not None else None
+        descendant_dns = [
+            entry.entry_dn
+            for entry in iter_paged_search(connection, entry_dn, '(objectClass=*)',
+                                           scope, ['1.1'], DELETE_PAGE_SIZE)
+            # Compared by depth, as the server may spell the base DN differently
+            if len(split_dn(entry.entry_dn)) > base_depth
+            and (depth_limit is None or len(split_dn(entry.entry_dn)) <= depth_limit)
+        ]
+
+        # Deepest entries first, so every entry is a leaf when it is deleted
+        descendant_dns.sort(key=lambda dn: len(split_dn(dn)), reverse=True)
+        owned_pool = None
+        if pool is None and pool_factory is not None and descendant_dns:
+            pool = owned_pool = pool_factory()
+        try:
+            if pool is None:
+                for child_dn in descendant_dns:
+                    _delete_one(connection, child_dn, controls)
+            else:
+                # Entries at one depth never contain each other, so each level is
+                # pipelined and only the level boundaries wait for responses
+                for _, level in groupby(descendant_dns, key=lambda dn: len(split_dn(dn))):
+                    _collect_responses(pool, "Delete",
+                                       [(dn, pool.delete(dn, controls=controls)) for dn in level])
+        finally:
+            if owned_pool is not None:
+                owned_pool.unbind()
+
+    return _delete_one(connection, entry_dn, controls)
 
-        children_dns = [entry.entry_dn for entry in connection.entries]
-        for child_dn in children_dns:
-            # Recursive call
-            delete_entry(connection, child_dn, recursive=True, controls=controls)
 
+def _collect_responses(connection: Connection, operation: str,
+                       requests: List[Tuple[str, Any]]) -> None:
+    """
+    Waits for pipelined (dn, message_id) requests sent on an asynchronous
+    connection, raising RuntimeError for the first one that failed.
+    """
+    failure = None
+    for dn, message_id in requests:
+        _, result = connection.strategy.get_response(message_id)
+        if result['result'] != 0 and failure is None:
+            failure = (f"LDAP {operation} operation failed for {dn}: "
+                       f"{result.get('description', 'Unknown error')}")
+    if failure is not None:
+        raise RuntimeError(failure)
+
+
+def _delete_one(connection: Connection, entry_dn: str, controls=None) -> bool:
+    """Deletes a single LDAP entry, raising RuntimeError on failure."""
     if connection.delete(entry_dn, controls=controls):
         return True
 
@@ -49,6 +184,7 @@ def modify_entry(connection: Connection, dn: str, modifications: Dict[str, Any],
     """Modifies an existing LDAP entry."""
     # The `modifications` dict is expected to be pre-formatted with ldap3.MODIFY_ADD, etc.
     if connection.modify(dn, modifications, controls=controls):
+        search_cache.flush(dn)
         return True
 
     error_message = (connection.result.get('description', 'Unknown error')
@@ -72,47 +208,64 @@ def compare_entry(connection: Connection, dn: str, attribute: str, _value: str,
     raise NotImplementedError(msg)
 
 
+@dataclass(frozen=True, slots=True)
+class _ObjectClass:
+    """Simulated object class definition."""
+    must_contain: Tuple[str, ...]
+    may_contain: Tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class _AttributeType:
+    """Simulated attribute type definition."""
+    syntax: str
+    equality: str
+
+
+# Simulated schema, built once at import instead of on every lookup; every
+# caller shares these definitions, so they are fully immutable
+_MOCK_OBJECT_CLASSES = {
+    "person": _ObjectClass(must_contain=('cn', 'sn'), may_contain=('mail', 'telephoneNumber')),
+    "groupOfNames": _ObjectClass(must_contain=('member', 'cn'), may_contain=('description',))
+}
+_MOCK_ATTRIBUTE_TYPES = {
+    "cn": _AttributeType(syntax='1.3.6.1.4.1.1466.115.121.1.15', equality='caseIgnoreMatch'),
+    "sn": _AttributeType(syntax='1.3.6.1.4.1.1466.115.121.1.15', equality='caseIgnoreMatch'),
+    "mail": _AttributeType(syntax='1.3.6.1.4.1.1466.115.121.1.26', equality='caseIgnoreIA5Match')
+}
+
+
 def get_schema_info(_connection: Connection, schema_type: str, name: Optional[str] = None) -> Any:
     """
     Retrieves schema information (object classes or attribute types).
-    Placeholder implementation using mocked data. Connection argument is for API consistency.
+    Placeholder implementation using simulated data. Connection argument is for API consistency.
     """
     # This placeholder simulates schema access for testing purposes.
     # A real implementation would use `_connection.server.schema`.
-    mock_schema_objectclasses = {
-        "person": MagicMock(must_contain=['cn', 'sn'], may_contain=['mail', 'telephoneNumber']),
-        "groupOfNames": MagicMock(must_contain=['member', 'cn'], may_contain=['description'])
-    }
-    mock_schema_attributetypes = {
-        "cn": MagicMock(syntax='1.3.6.1.4.1.1466.115.121.1.15', equality='caseIgnoreMatch'),
-        "sn": MagicMock(syntax='1.3.6.1.4.1.1466.115.121.1.15', equality='caseIgnoreMatch'),
-        "mail": MagicMock(syntax='1.3.6.1.4.1.1466.115.121.1.26', equality='caseIgnoreIA5Match')
-    }
-
     if schema_type == "objectclasses":
         if name:
-            data = mock_schema_objectclasses.get(name)
+            data = _MOCK_OBJECT_CLASSES.get(name)
             if data is None:
                 raise ValueError(f"Mock schema: Object class '{name}' not found.")
             return data
-        return list(mock_schema_objectclasses.keys())
+        return list(_MOCK_OBJECT_CLASSES)
 
     if schema_type == "objectclass" and name:  # Alias for specific object class
-        data = mock_schema_objectclasses.get(name)
+        data = _MOCK_OBJECT_CLASSES.get(name)
         if data is None:
             raise ValueError(f"Mock schema: Object class '{name}' not found.")
         return data
 
     if schema_type == "attributetypes":
         if name:
-            data = mock_schema_attributetypes.get(name)
+            data = _MOCK_ATTRIBUTE_TYPES.get(name)
             if data is None:
                 raise ValueError(f"Mock schema: Attribute type '{name}' not found.")
             return data
-        return list(mock_schema_attributetypes.keys())
+        return list(_MOCK_ATTRIBUTE_TYPES)
 
     if schema_type == "attributetype" and name:  # Alias for specific attribute type
-        data = mock_schema_attributetypes.get(name)
+        data = _MOCK_ATTRIBUTE_TYPES.get(name)
         if data is None:
             raise ValueError(f"Mock schema: Attribute type '{name}' not found.")
         return data
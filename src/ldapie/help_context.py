@@ -174,6 +174,23 @@ COMMAND_PATTERNS = {
     }
 }
 
+# Markup templates for the bulleted help lists (examples, tips, next steps,
+# options); every help view formats its items from these
+EXAMPLE_FMT = "  [command]{}[/command]"
+TIP_FMT = "  [info]• {}[/info]"
+NEXT_FMT = "  [success]• {}[/success]"
+OPTION_FMT = "  [option]{}[/option]"
+
+def format_items(fmt: str, items: List[str]) -> str:
+    """
+    Format each item with fmt, one per line, ready for a single console.print.
+    
+    Example:
+        >>> format_items(TIP_FMT, ["Use --tree", "Use --json"])
+        '  [info]• Use --tree[/info]\\n  [info]• Use --json[/info]'
+    """
+    return "\n".join(map(fmt.format, items))
+
 class HelpContext:
     """
     Singleton class that tracks command history and operational context
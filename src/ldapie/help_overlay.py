@@ -31,9 +31,11 @@ from rich.rule import Rule
 from rich.markdown import Markdown
 
 try:
-    from ldapie.help_context import HelpContext, CommandValidator, COMMAND_PATTERNS
+    from ldapie.help_context import (HelpContext, CommandValidator, COMMAND_PATTERNS,
+                                     EXAMPLE_FMT, TIP_FMT, NEXT_FMT, OPTION_FMT)
 except ImportError:
-    from src.ldapie.help_context import HelpContext, CommandValidator, COMMAND_PATTERNS
+    from src.ldapie.help_context import (HelpContext, CommandValidator, COMMAND_PATTERNS,
+                                         EXAMPLE_FMT, TIP_FMT, NEXT_FMT, OPTION_FMT)
 
 def parse_partial_command(input_text: str) -> Dict[str, Any]:
     """
@@ -258,36 +260,36 @@ def show_help_overlay(input_text: str, help_context: HelpContext, console: Conso
     # Add frequently used commands if available
     if "frequent_commands" in help_info and help_info["frequent_commands"]:
         help_table.add_row("[bold]Frequently Used Commands:[/bold]")
-        for cmd in help_info["frequent_commands"]:
-            help_table.add_row(f"  [command]{cmd}[/command]")
+        for row in map(EXAMPLE_FMT.format, help_info["frequent_commands"]):
+            help_table.add_row(row)
         help_table.add_row("")
         
     # Add options if available
     if "options" in help_info and help_info["options"]:
         help_table.add_row("[bold]Useful Options:[/bold]")
-        for option in help_info["options"]:
-            help_table.add_row(f"  [option]{option}[/option]")
+        for row in map(OPTION_FMT.format, help_info["options"]):
+            help_table.add_row(row)
         help_table.add_row("")
     
     # Add tips if available
     if "tips" in help_info and help_info["tips"]:
         help_table.add_row("[bold]Tips & Common Issues:[/bold]")
-        for tip in help_info["tips"]:
-            help_table.add_row(f"  [info]• {tip}[/info]")
+        for row in map(TIP_FMT.format, help_info["tips"]):
+            help_table.add_row(row)
         help_table.add_row("")
     
     # Add examples if available
     if "examples" in help_info and help_info["examples"]:
         help_table.add_row("[bold]Examples:[/bold]")
-        for example in help_info["examples"]:
-            help_table.add_row(f"  [command]{example}[/command]")
+        for row in map(EXAMPLE_FMT.format, help_info["examples"]):
+            help_table.add_row(row)
         help_table.add_row("")
     
     # Add suggestions if available
     if "suggestions" in help_info and help_info["suggestions"]:
         help_table.add_row("[bold]Suggestions:[/bold]")
-        for suggestion in help_info["suggestions"]:
-            help_table.add_row(f"  [success]• {suggestion}[/success]")
+        for row in map(NEXT_FMT.format, help_info["suggestions"]):
+            help_table.add_row(row)
     
     # Create and display the panel
     panel = Panel(
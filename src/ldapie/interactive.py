@@ -6,22 +6,72 @@ Interactive shell functionality for LDAPie.
 """
 
 import os
+import sys
 import cmd
+import asyncio
 import readline
-from typing import Optional, Any, List, Dict
+from collections import deque
+from typing import Optional, Any, List, Dict, Deque
 import ldap3
 from ldap3 import Server, Connection, SUBTREE, ALL_ATTRIBUTES
+from ldap3.core.exceptions import LDAPBindError
 from rich.console import Console
 from rich.panel import Panel
+from rich.table import Table
 from getpass import getpass
 
 # Assuming these are in the same directory or accessible via PYTHONPATH
-from .output import output_rich 
-from .schema import output_server_info_rich, show_schema
+from .output import render_entries
+from .schema import load_server_info, output_server_info_rich, render_schema, schema_cache
+from .search import iter_paged_search, search_cache, search_cache_key, SEARCH_CACHE_MAX_ENTRIES
+from .utils import split_args
+
+# Readline history location, expanded once at import
+HISTORY_FILE = os.path.expanduser('~/.ldapie_history')
+
+# Entries requested per page when streaming interactive search results
+DEFAULT_PAGE_SIZE = 500
+
+# Entries rendered per console.print call while streaming search results
+RENDER_BATCH_SIZE = 50
+
+# Reopen attempts before a restartable connection gives up
+RESTARTABLE_TRIES = 3
+
+# Server objects by URI; each keeps its root DSE and schema across reconnects
+_server_cache: Dict[str, Server] = {}
+
+# Title and (header, style) columns for each 'history' view; None is the combined view
+HISTORY_TABLES: Dict[Optional[str], Any] = {
+    None: ("Command History", (("Type", "cyan"), ("Value", "green"))),
+    'search': ("Search History", (("#", "dim"), ("Filter", "green"))),
+    'base': ("Base DN History", (("#", "dim"), ("DN", "green"))),
+    'host': ("Host History", (("#", "dim"), ("Host", "green"))),
+}
+
+
+def build_history_table(kind: Optional[str], rows: List[tuple]) -> Table:
+    """
+    Build the table for one 'history' view from prepared rows.
+    
+    Args:
+        kind: History type ('search', 'base', 'host') or None for all types
+        rows: Row tuples matching the view's columns
+        
+    Returns:
+        Rich Table ready to print
+    """
+    title, columns = HISTORY_TABLES[kind]
+    table = Table(title=title, show_header=True)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    for row in rows:
+        table.add_row(*row)
+    return table
 
 # Import context-sensitive help components if available
 try:
-    from .help_context import HelpContext, CommandValidator
+    from .help_context import HelpContext, CommandValidator, format_items, EXAMPLE_FMT, TIP_FMT, NEXT_FMT
     from .help_overlay import show_help_overlay
     help_available = True
 except ImportError:
@@ -30,9 +80,21 @@ except ImportError:
     CommandValidator = None
     show_help_overlay = None
 
+# prompt_toolkit drives the asyncio REPL; fall back to cmd.Cmd's loop without it
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.history import InMemoryHistory
+    from .tab_completion import LDAPCompleter
+    prompt_toolkit_available = True
+except ImportError:
+    prompt_toolkit_available = False
+    PromptSession = None
+    InMemoryHistory = None
+    LDAPCompleter = None
+
 
 class LDAPShell(cmd.Cmd):
-    intro = "\\nWelcome to LDAPie interactive console. Type help or ? to list commands.\\n"
+    intro = "\nWelcome to LDAPie interactive console. Type help or ? to list commands.\n"
     prompt = "ldapie> "
     
     def __init__(self, server: Optional[Server], conn: Optional[Connection], console: Console, base_dn: Optional[str] = None):
@@ -43,36 +105,46 @@ class LDAPShell(cmd.Cmd):
         self.base_dn = base_dn or ""
         self.connected = conn is not None and conn.bound
         self.help_context = HelpContext() if help_available and HelpContext else None
-        self.search_history: List[str] = []
-        self.query_history: Dict[str, List[str]] = {
-            'search': [],    # Store search filters
-            'base': [],      # Store base DNs
-            'host': []       # Store host names
+        # Validator for 'validate'; it only reads the shared help context
+        self.validator = CommandValidator(self.help_context) if help_available and CommandValidator else None
+        # Rendered schema views keyed by (object_class, attribute); the schema
+        # is static for a connection, so this is only cleared on reconnect
+        self._schema_cache: Dict[tuple, Any] = {}
+        # Session history ring buffers; deque(maxlen) evicts the oldest entry.
+        # Kept apart from query_history, which enhance_shell replaces with
+        # the persistent QueryHistory used for tab completion.
+        self.search_history: Deque[str] = deque(maxlen=20)
+        self.session_history: Dict[str, Deque[str]] = {
+            'search': self.search_history,  # Store search filters
+            'base': deque(maxlen=20),       # Store base DNs
+            'host': deque(maxlen=20)        # Store host names
         }
         
         # Set up readline for tab completion and history
-        readline.set_completer_delims(' \\t\\n')
+        readline.set_completer_delims(' \t\n')
         # The completer will be set by enhance_shell if available
         # readline.set_completer(self.complete) 
         readline.parse_and_bind('tab: complete')
         
-        self.history_file = os.path.expanduser('~/.ldapie_history')
+        self.history_file = HISTORY_FILE
         try:
+            readline.read_history_file(self.history_file)
+        except FileNotFoundError:
+            # First run: make sure the directory exists for saving later
             history_dir = os.path.dirname(self.history_file)
-            if not os.path.exists(history_dir) and history_dir:
+            if history_dir:
                 try:
                     os.makedirs(history_dir, exist_ok=True)
                 except (OSError, PermissionError) as e:
                     console.print(f"[warning]Could not create history directory: {e}[/warning]")
-    
-            if os.path.exists(self.history_file):
-                readline.read_history_file(self.history_file)
-    
         except (OSError, IOError, PermissionError) as e:
             console.print(f"[warning]Could not read history file: {e}[/warning]")
             console.print("[info]History will not be saved.[/info]")
             self.history_file = None # type: ignore
         
+        # Lines added after this point are the ones that still need saving
+        self._history_baseline = readline.get_current_history_length()
+        
         self._update_prompt()
         
         if help_available and self.help_context:
@@ -83,6 +155,12 @@ class LDAPShell(cmd.Cmd):
                 authenticated=self.connected and self.conn.bound if self.conn else False
             )
     
+    def _remember(self, history_type: str, value: str) -> None:
+        """Record a value in the session history unless it is already there."""
+        bucket = self.session_history[history_type]
+        if value not in bucket:
+            bucket.append(value)
+    
     def _update_prompt(self):
         base_str = f" [{self.base_dn}]" if self.base_dn else ""
         self.prompt = f"ldapie{base_str}> "
@@ -98,17 +176,81 @@ class LDAPShell(cmd.Cmd):
         try:
             super().cmdloop(intro=None)
         finally:
-            if hasattr(self, 'history_file') and self.history_file:
-                try:
-                    readline.set_history_length(1000)
-                    readline.write_history_file(self.history_file)
-                except (OSError, IOError, PermissionError) as e:
-                    self.console.print(f"[warning]Could not save history: {e}[/warning]")
+            self._save_history()
 
-    def get_input(self, prompt: str) -> str:
-        """Custom input handler that supports '?' for context help"""
-        line = input(prompt)
+    async def _async_cmdloop(self, intro: Optional[str] = None) -> None:
+        """
+        Run the shell on an asyncio event loop using prompt_toolkit.
         
+        Commands are dispatched to a worker thread so the blocking ldap3
+        calls they make never run on the event loop itself.
+        """
+        if intro is not None:
+            self.intro = intro
+        if self.intro:
+            self.console.print(self.intro)
+            self.intro = None
+            
+        # Seed the prompt history from readline so both loops share one history file
+        history = InMemoryHistory()
+        for i in range(1, readline.get_current_history_length() + 1):
+            item = readline.get_history_item(i)
+            if item:
+                history.append_string(item)
+                
+        tab_completer = getattr(self, 'tab_completer', None)
+        session = PromptSession(
+            history=history,
+            completer=LDAPCompleter(tab_completer) if tab_completer else None
+        )
+        
+        try:
+            await self._prompt_loop(session)
+        finally:
+            self._save_history()
+
+    async def _prompt_loop(self, session: Any) -> None:
+        """Read lines from the prompt session and run them until a command stops the loop."""
+        loop = asyncio.get_running_loop()
+        stop = False
+        while not stop:
+            try:
+                line = await session.prompt_async(self.prompt)
+            except KeyboardInterrupt:
+                continue
+            except EOFError:
+                self.do_exit("")
+                break
+                
+            if line.strip():
+                readline.add_history(line)
+            line = self._handle_help_key(line)
+            line = self.precmd(line)
+            stop = await loop.run_in_executor(None, self.onecmd, line)
+            stop = self.postcmd(stop, line)
+
+    def _save_history(self) -> None:
+        """Append commands entered this session to the history file."""
+        if not (hasattr(self, 'history_file') and self.history_file):
+            return
+            
+        new_items = readline.get_current_history_length() - self._history_baseline
+        if new_items <= 0:
+            return
+            
+        try:
+            readline.set_history_length(1000)
+            try:
+                readline.append_history_file(new_items, self.history_file)
+            except (AttributeError, OSError):
+                # No append support (libedit) or no history file yet
+                readline.write_history_file(self.history_file)
+            self._history_baseline = readline.get_current_history_length()
+        except (OSError, IOError, PermissionError) as e:
+            self.console.print(f"[warning]Could not save history: {e}[/warning]")
+
+    def _handle_help_key(self, line: str) -> str:
+        """Show the help overlay for lines containing '?' and swallow them."""
         if help_available and show_help_overlay and self.help_context and ('?' in line):
             if ' ?' in line:
                 line_without_question = line.replace(' ?', '').strip()
@@ -119,6 +261,10 @@ class LDAPShell(cmd.Cmd):
             return "" 
         
         return line
+
+    def get_input(self, prompt: str) -> str:
+        """Custom input handler that supports '?' for context help"""
+        return self._handle_help_key(input(prompt))
     
     def onecmd(self, line: str) -> bool:
         """Override onecmd to add command history and validation"""
@@ -139,66 +285,86 @@ class LDAPShell(cmd.Cmd):
             self.console.print("[error]Please provide a command to validate[/error]")
             return
             
-        if not help_available or not CommandValidator:
+        if not self.validator:
             self.console.print("[error]Command validation is not available[/error]")
             return
         
-        validator = CommandValidator(self.help_context) # type: ignore
-        result = validator.validate_command(arg)
+        result = self.validator.validate_command(arg)
         
         if "error" in result:
             self.console.print(f"[error]Error: {result['error']}[/error]")
             if "suggestion" in result:
                 self.console.print(f"[info]Suggestion: {result['suggestion']}[/info]")
             if "examples" in result:
-                self.console.print("\\n[bold]Examples:[/bold]")
-                for example in result['examples']:
-                    self.console.print(f"  [command]{example}[/command]")
+                self.console.print("\n[bold]Examples:[/bold]")
+                self.console.print(format_items(EXAMPLE_FMT, result['examples']))
         else:
             if "validation" in result:
                 self.console.print(f"[success]✓ {result['validation']}[/success]")
             if "preview" in result:
-                self.console.print(f"\\n[bold]Preview:[/bold] {result['preview']}")
+                self.console.print(f"\n[bold]Preview:[/bold] {result['preview']}")
             if "warning" in result:
-                self.console.print(f"\\n[warning]Warning: {result['warning']}[/warning]")
+                self.console.print(f"\n[warning]Warning: {result['warning']}[/warning]")
             if "suggestion" in result:
-                self.console.print(f"\\n[info]Suggestion: {result['suggestion']}[/info]")
+                self.console.print(f"\n[info]Suggestion: {result['suggestion']}[/info]")
         
     def do_connect(self, arg: str) -> None:
         """
         Connect to an LDAP server
         Usage: connect host [port] [username] [--ssl]
         """
-        args = arg.split()
-        if not args:
+        host = None
+        port = None
+        username = None
+        use_ssl = False
+        # Single pass over the tokens so --ssl may appear anywhere and the
+        # port stays optional: "connect host --ssl user" binds as "user".
+        for tok in arg.split():
+            if tok == '--ssl':
+                use_ssl = True
+            elif host is None:
+                host = tok
+            elif port is None and username is None and tok.isdigit():
+                port = int(tok)
+            elif username is None and not tok.startswith('-'):
+                username = tok
+        if host is None:
             self.console.print("[error]Must specify a hostname[/error]")
             return
-            
-        host = args[0]
-        port_str = args[1] if len(args) > 1 and args[1].isdigit() else None
-        port = int(port_str) if port_str else None
-        username = args[2] if len(args) > 2 and not args[2].startswith('-') else None
-        use_ssl = '--ssl' in args
         
         try:
             server_uri = f"{'ldaps' if use_ssl else 'ldap'}://{host}"
             if port:
                 server_uri += f":{port}"
                 
-            self.server = ldap3.Server(server_uri, get_info=ldap3.ALL)
+            self.server = _server_cache.get(server_uri)
+            if self.server is None:
+                # Server info and schema are read on the first info/schema command
+                self.server = ldap3.Server(server_uri, get_info=ldap3.NONE)
+                _server_cache[server_uri] = self.server
             
+            # RESTARTABLE transparently reopens and rebinds dropped sockets
+            conn_options = {
+                'client_strategy': ldap3.RESTARTABLE,
+                'receive_timeout': 10,
+            }
             if username:
                 password = getpass(f"Password for {username}: ")
-                self.conn = ldap3.Connection(self.server, user=username, password=password, auto_bind=True)
+                self.conn = ldap3.Connection(self.server, user=username, password=password, **conn_options)
             else:
-                self.conn = ldap3.Connection(self.server, auto_bind=True)
+                self.conn = ldap3.Connection(self.server, **conn_options)
+            # ldap3 retries 30 times by default; give up quickly on a bad host
+            self.conn.strategy.restartable_tries = RESTARTABLE_TRIES
+            self.conn.strategy.restartable_sleep_time = 1
+            if not self.conn.bind():
+                raise LDAPBindError(self.conn.result.get('description', 'bind failed'))
                 
             self.connected = True
+            self._schema_cache.clear()
+            schema_cache.flush()
             self.console.print(f"[success]Connected to {host}[/success]")
             
-            if host not in self.query_history.get('host', []):
-                self.query_history.setdefault('host', []).append(host)
-                self.query_history['host'] = self.query_history['host'][-20:]
+            self._remember('host', host)
             
             self._update_prompt()
             
@@ -223,9 +389,7 @@ class LDAPShell(cmd.Cmd):
             self._update_prompt()
             self.console.print(f"[info]Base DN set to: {self.base_dn}[/info]")
             
-            if arg not in self.query_history.get('base', []):
-                self.query_history.setdefault('base', []).append(arg)
-                self.query_history['base'] = self.query_history['base'][-20:]
+            self._remember('base', arg)
             
             if help_available and self.help_context:
                 self.help_context.current_context["base_dn"] = arg
@@ -235,7 +399,10 @@ class LDAPShell(cmd.Cmd):
     def do_search(self, arg: str) -> None:
         """
         Search the LDAP directory
-        Usage: search [filter] [attribute1 attribute2 ...]
+        Usage: search [filter] [attribute1 attribute2 ...] [--page N] [--cached]
+        
+        --cached answers a repeat of a recent search from the search cache
+        instead of the server; by default every search goes to the server.
         """
         if not self.connected or not self.conn:
             self.console.print("[error]Not connected to any LDAP server[/error]")
@@ -245,11 +412,21 @@ class LDAPShell(cmd.Cmd):
             self.console.print("[error]Base DN not set. Use 'base' command to set it.[/error]")
             return
             
-        import shlex
-        try:
-            args = shlex.split(arg)
-        except ValueError:
-            args = arg.split()
+        args = split_args(arg)
+            
+        page_size = DEFAULT_PAGE_SIZE
+        if '--page' in args:
+            page_idx = args.index('--page')
+            try:
+                page_size = int(args[page_idx + 1])
+            except (IndexError, ValueError):
+                self.console.print("[error]--page requires a numeric page size[/error]")
+                return
+            del args[page_idx:page_idx + 2]
+        
+        use_cache = '--cached' in args
+        if use_cache:
+            args.remove('--cached')
             
         filter_query = args[0] if args else "(objectClass=*)"
         attributes = args[1:] if len(args) > 1 else ALL_ATTRIBUTES
@@ -259,31 +436,57 @@ class LDAPShell(cmd.Cmd):
         
         try:
             self.console.print(f"[info]Searching with filter: {filter_query}[/info]")
-            self.conn.search(
-                self.base_dn, 
-                filter_query, 
-                search_scope=SUBTREE, 
-                attributes=attributes
-            )
             
-            if not self.conn.entries:
+            # With --cached, a repeat of a recent search is answered from
+            # search_cache; the shell has no writes that would flush it, so
+            # this is only done on request and said so
+            cache_key = search_cache_key(self.conn, self.base_dn, filter_query, SUBTREE, attributes)
+            cached_entries = search_cache.get(cache_key) if use_cache else None
+            if cached_entries is not None:
+                self.console.print(f"[info](cached) Results from up to {int(search_cache.ttl)}s ago[/info]")
+                entries = iter(cached_entries)
+            else:
+                entries = iter_paged_search(
+                    self.conn,
+                    self.base_dn,
+                    filter_query,
+                    SUBTREE,
+                    attributes,
+                    page_size
+                )
+            
+            # Print results in batches as pages arrive instead of holding the
+            # whole result set; each batch is a single console write. The
+            # first SEARCH_CACHE_MAX_ENTRIES results are also kept, for the
+            # cache (when that is all of them) and the help context.
+            count = 0
+            batch: List[Any] = []
+            kept: List[Any] = []
+            for entry in entries:
+                batch.append(entry)
+                count += 1
+                if count <= SEARCH_CACHE_MAX_ENTRIES:
+                    kept.append(entry)
+                if len(batch) >= RENDER_BATCH_SIZE:
+                    self.console.print(render_entries(batch))
+                    batch.clear()
+            if batch:
+                self.console.print(render_entries(batch))
+            if cached_entries is None and count <= SEARCH_CACHE_MAX_ENTRIES:
+                search_cache.put(cache_key, list(kept))
+            
+            if not count:
                 self.console.print("[warning]No entries found.[/warning]")
                 return
                 
-            self.console.print(f"[success]Found {len(self.conn.entries)} entries.[/success]")
-            output_rich(self.conn.entries, self.console) # type: ignore
+            self.console.print(f"[success]Found {count} entries.[/success]")
             
-            if filter_query not in self.search_history:
-                self.search_history.append(filter_query)
-                if len(self.search_history) > 20:
-                    self.search_history = self.search_history[-20:]
-            
-            if filter_query not in self.query_history.get('search', []):
-                self.query_history.setdefault('search', []).append(filter_query)
-                self.query_history['search'] = self.query_history['search'][-20:]
+            self._remember('search', filter_query)
             
             if help_available and self.help_context:
-                self.help_context.update_search_results(self.conn.entries)
+                # The entries just shown, not conn.entries: that holds only the
+                # last page, or a previous query's results after a cache hit
+                self.help_context.update_search_results(kept)
             
         except Exception as e:
             self.console.print(f"[error]Search failed: {e}[/error]")
@@ -295,7 +498,13 @@ class LDAPShell(cmd.Cmd):
         if not self.connected or not self.server or not self.conn:
             self.console.print("[error]Not connected to any LDAP server[/error]")
             return
-        output_server_info_rich(self.server, self.conn, self.console)
+        # Commands already run off the event loop, so the prompt stays
+        # responsive while the server info is read and rendered in turn
+        try:
+            load_server_info(self.server, self.conn, ldap3.DSA)
+            output_server_info_rich(self.server, self.console)
+        except Exception as e:
+            self.console.print(f"[error]{e}[/error]")
     
     def do_schema(self, arg: str) -> None:
         """
@@ -305,14 +514,24 @@ class LDAPShell(cmd.Cmd):
         if not self.connected or not self.server:
             self.console.print("[error]Not connected to any LDAP server[/error]")
             return
-            
         args = arg.split()
         if not args:
-            show_schema(self.server, None, None, self.console)
+            key = (None, None)
         elif args[0] == '--attr' and len(args) > 1:
-            show_schema(self.server, None, args[1], self.console)
+            key = (None, args[1])
         else:
-            show_schema(self.server, args[0], None, self.console)
+            key = (args[0], None)
+        try:
+            load_server_info(self.server, self.conn)
+            self._show_schema_cached(key)
+        except Exception as e:
+            self.console.print(f"[error]{e}[/error]")
+    
+    def _show_schema_cached(self, key: tuple) -> None:
+        """Print a schema view, rendering it only on first request."""
+        if key not in self._schema_cache:
+            self._schema_cache[key] = render_schema(self.server, *key)
+        self.console.print(self._schema_cache[key])
     
     def do_exit(self, arg: str) -> bool:
         """Exit the interactive console"""
@@ -331,23 +550,20 @@ class LDAPShell(cmd.Cmd):
             
         suggestions = self.help_context.get_suggestions()
         
-        self.console.print("\\n[bold]Context-Aware Suggestions[/bold]")
+        self.console.print("\n[bold]Context-Aware Suggestions[/bold]")
         self.console.rule()
         
         if suggestions["next_commands"]:
-            self.console.print("\\n[bold]Next Steps[/bold]")
-            for suggestion in suggestions["next_commands"]:
-                self.console.print(f"  [success]• {suggestion}[/success]")
+            self.console.print("\n[bold]Next Steps[/bold]")
+            self.console.print(format_items(NEXT_FMT, suggestions["next_commands"]))
                 
         if suggestions["examples"]:
-            self.console.print("\\n[bold]Examples[/bold]")
-            for example in suggestions["examples"]:
-                self.console.print(f"  [command]{example}[/command]")
+            self.console.print("\n[bold]Examples[/bold]")
+            self.console.print(format_items(EXAMPLE_FMT, suggestions["examples"]))
                 
         if suggestions["tips"]:
-            self.console.print("\\n[bold]Tips[/bold]")
-            for tip in suggestions["tips"]:
-                self.console.print(f"  [info]• {tip}[/info]")
+            self.console.print("\n[bold]Tips[/bold]")
+            self.console.print(format_items(TIP_FMT, suggestions["tips"]))
                 
         if not any([suggestions["next_commands"], suggestions["examples"], suggestions["tips"]]):
             self.console.print("  No specific suggestions available for current context.")
@@ -357,43 +573,23 @@ class LDAPShell(cmd.Cmd):
         View command history or specific query types
         Usage: history [search|base|host]
         """
-        from rich.table import Table # Local import for this method
-        
-        if not arg:
-            table = Table(title="Command History", show_header=True)
-            table.add_column("Type", style="cyan")
-            table.add_column("Value", style="green")
+        if arg and arg not in HISTORY_TABLES:
+            self.console.print("[info]Available types: search, base, host[/info]")
+            return
             
-            for filter_query in self.search_history:
-                table.add_row("search", filter_query)
-            for base_dn_val in self.query_history.get('base', []): # Renamed to avoid conflict
-                table.add_row("base", base_dn_val)
-            for host_val in self.query_history.get('host', []): # Renamed to avoid conflict
-                table.add_row("host", host_val)
-            self.console.print(table)
-        elif arg == "search":
-            table = Table(title="Search History", show_header=True)
-            table.add_column("#", style="dim")
-            table.add_column("Filter", style="green")
-            for i, filter_query in enumerate(self.search_history, 1):
-                table.add_row(str(i), filter_query)
-            self.console.print(table)
-        elif arg == "base":
-            table = Table(title="Base DN History", show_header=True)
-            table.add_column("#", style="dim")
-            table.add_column("DN", style="green")
-            for i, base_dn_val in enumerate(self.query_history.get('base', []), 1): # Renamed
-                table.add_row(str(i), base_dn_val)
-            self.console.print(table)
-        elif arg == "host":
-            table = Table(title="Host History", show_header=True)
-            table.add_column("#", style="dim")
-            table.add_column("Host", style="green")
-            for i, host_val in enumerate(self.query_history.get('host', []), 1): # Renamed
-                table.add_row(str(i), host_val)
-            self.console.print(table)
+        if not arg:
+            rows = [("search", filter_query) for filter_query in self.search_history]
+            rows += [("base", base_dn_val) for base_dn_val in self.session_history['base']]
+            rows += [("host", host_val) for host_val in self.session_history['host']]
         else:
-            self.console.print("[info]Available types: search, base, host[/info]")
+            values = self.session_history[arg]
+            rows = [(str(i), value) for i, value in enumerate(values, 1)]
+            
+        if not rows:
+            self.console.print("[info]No history entries[/info]")
+            return
+            
+        self.console.print(build_history_table(arg or None, rows))
             
     def do_help(self, arg: str) -> None:
         """Show help for commands"""
@@ -402,13 +598,11 @@ class LDAPShell(cmd.Cmd):
             if help_available and self.help_context:
                 cmd_help = self.help_context.get_command_help(arg)
                 if 'examples' in cmd_help and cmd_help['examples']:
-                    self.console.print("\\n[bold]Examples:[/bold]")
-                    for example in cmd_help['examples']:
-                        self.console.print(f"  [command]{example}[/command]")
+                    self.console.print("\n[bold]Examples:[/bold]")
+                    self.console.print(format_items(EXAMPLE_FMT, cmd_help['examples']))
                 if 'common_errors' in cmd_help and cmd_help['common_errors']:
-                    self.console.print("\\n[bold]Common Issues:[/bold]")
-                    for tip in cmd_help['common_errors']:
-                        self.console.print(f"  [info]• {tip}[/info]")
+                    self.console.print("\n[bold]Common Issues:[/bold]")
+                    self.console.print(format_items(TIP_FMT, cmd_help['common_errors']))
         else:
             self.console.print(
                 Panel(
@@ -416,7 +610,7 @@ class LDAPShell(cmd.Cmd):
                     Available commands:
                     - connect host [port] [username] [--ssl]  Connect to LDAP server
                     - base <dn>                              Set base DN for operations
-                    - search [filter] [attributes...]         Search the directory
+                    - search [filter] [attributes...] [--page N] [--cached]  Search the directory
                     - info                                   Show server information
                     - schema [objectclass|--attr name]        Browse schema information
                     - validate <command>                      Validate a command without executing it
@@ -435,13 +629,11 @@ class LDAPShell(cmd.Cmd):
             if help_available and self.help_context:
                 suggestions = self.help_context.get_suggestions()
                 if suggestions["next_commands"]:
-                    self.console.print("\\n[bold]Suggested Next Steps[/bold]")
-                    for suggestion in suggestions["next_commands"]:
-                        self.console.print(f"  [success]• {suggestion}[/success]")
+                    self.console.print("\n[bold]Suggested Next Steps[/bold]")
+                    self.console.print(format_items(NEXT_FMT, suggestions["next_commands"]))
                 if suggestions["tips"]:
-                    self.console.print("\\n[bold]Tips[/bold]")
-                    for tip in suggestions["tips"]:
-                        self.console.print(f"  [info]• {tip}[/info]")
+                    self.console.print("\n[bold]Tips[/bold]")
+                    self.console.print(format_items(TIP_FMT, suggestions["tips"]))
 
 def start_interactive_session(server: Optional[Server], conn: Optional[Connection], console: Console, base_dn: Optional[str] = None) -> None:
     """
@@ -457,4 +649,8 @@ def start_interactive_session(server: Optional[Server], conn: Optional[Connectio
     except Exception as e:
         console.print(f"[warning]Could not enhance shell: {e}[/warning]")
 
-    shell.cmdloop()
+    # prompt_toolkit needs a real terminal; piped input keeps the plain cmd loop
+    if prompt_toolkit_available and sys.stdin.isatty():
+        asyncio.run(shell._async_cmdloop())
+    else:
+        shell.cmdloop()
@@ -26,19 +26,31 @@ Usage:
     ldapie interactive [options]
 """
 
+from __future__ import annotations
+
 import os
 import sys
+import mmap
+import socket
+import atexit
+import itertools
+import threading
+import contextvars
+import importlib.util
+from collections import defaultdict
 from . import __version__
 import click
 import getpass
 import json as json_lib  # Renamed to avoid conflicts with parameter names
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, TYPE_CHECKING
 import traceback  # For debug stack traces
 from rich.console import Console
 from rich.theme import Theme
-from rich.table import Table
-from ldap3 import Server, Connection, ALL, ALL_ATTRIBUTES, SUBTREE, BASE, LEVEL, MODIFY_ADD, MODIFY_DELETE, MODIFY_REPLACE
-from ldap3.core.exceptions import LDAPException, LDAPBindError
+
+# ldap3 pulls in its whole protocol and schema engine, so it is imported
+# inside the functions that talk to a server rather than at startup
+if TYPE_CHECKING:
+    from ldap3 import Server, Connection
 
 # Define color themes before importing other modules to avoid circular imports
 DARK_THEME = {
@@ -72,38 +84,93 @@ LIGHT_THEME = {
 # Get theme from environment or default to dark
 theme_name = os.environ.get("LDAPIE_THEME", "dark").lower()
 theme_colors = LIGHT_THEME if theme_name == "light" else DARK_THEME
-console = Console(theme=Theme(theme_colors))
+
+# Theme objects are built once; --theme pushes one onto the console's stack
+THEMES = {"dark": Theme(DARK_THEME), "light": Theme(LIGHT_THEME)}
+console = Console(theme=THEMES["light" if theme_name == "light" else "dark"])
+
+def _lazy_import(name: str):
+    """
+    Import a sibling module lazily.
+    
+    The module object is returned immediately but only executed on first
+    attribute access, so commands like --help and --version never pay for
+    modules they do not use.
+    
+    Args:
+        name: Module name relative to this package (e.g. "search")
+        
+    Returns:
+        The (possibly not yet executed) module
+    """
+    fullname = f"{__package__}.{name}"
+    module = sys.modules.get(fullname)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(fullname)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[fullname] = module
+    spec.loader.exec_module(module)
+    return module
 
 # Now import modules that might need the console
-try:
-    # Try importing as an installed package
-    from ldapie import search as search_utils
-    from ldapie import output as output_utils
-    from ldapie import schema as schema_utils
-    from ldapie import entry_operations as entry_utils
-    from ldapie import interactive as interactive_utils
-    from ldapie import utils as general_utils
-    from ldapie.rich_formatter import add_rich_help_option
-except ImportError:
-    # Fall back to development path
-    try:
-        # Try relative imports first (when running as part of a package)
-        from . import search as search_utils
-        from . import output as output_utils
-        from . import schema as schema_utils
-        from . import entry_operations as entry_utils
-        from . import interactive as interactive_utils
-        from . import utils as general_utils
-        from .rich_formatter import add_rich_help_option
-    except (ImportError, ValueError):
-        # Final fallback to fully qualified imports
-        from src.ldapie import search as search_utils
-        from src.ldapie import output as output_utils
-        from src.ldapie import schema as schema_utils
-        from src.ldapie import entry_operations as entry_utils
-        from src.ldapie import interactive as interactive_utils  
-        from src.ldapie import utils as general_utils
-        from src.ldapie.rich_formatter import add_rich_help_option
+search_utils = _lazy_import("search")
+output_utils = _lazy_import("output")
+schema_utils = _lazy_import("schema")
+entry_utils = _lazy_import("entry_operations")
+interactive_utils = _lazy_import("interactive")
+general_utils = _lazy_import("utils")
+from .rich_formatter import add_rich_help_option, print_rich_help
+
+# Help context of the running command, set by handle_connection_error
+_ACTIVE_HELP_CONTEXT: contextvars.ContextVar = contextvars.ContextVar("ldapie_help_context", default=None)
+
+# --scope choices mapped to ldap3.BASE/LEVEL/SUBTREE, and ldap3.ALL_ATTRIBUTES.
+# ldap3 defines these as plain strings; they are spelled out here so building
+# the CLI does not import ldap3
+_SCOPES = {"base": "BASE", "one": "LEVEL", "sub": "SUBTREE"}
+_ALL_ATTRIBUTES = "*"
+
+# Shared HelpContext instance; False until the first lookup, None if unavailable
+_help_context: Any = False
+
+
+def get_help_context():
+    """
+    Get the shared HelpContext, importing and creating it on first use.
+    
+    Returns:
+        The HelpContext singleton, or None if the help system cannot be imported
+    """
+    global _help_context
+    if _help_context is False:
+        try:
+            from .help_context import HelpContext
+            _help_context = HelpContext()
+        except ImportError:
+            _help_context = None
+    return _help_context
+
+
+# Bound connections keyed by (host, port, use_ssl, username, need_schema); values are
+# (server, connection, password) so a different password never reuses a bind
+_CONNECTION_CACHE: Dict[tuple, Tuple[Server, Connection, Optional[str]]] = {}
+_CONNECTION_LOCK = threading.Lock()
+
+# Server objects keyed by (host, port, use_ssl, need_schema); guarded by _CONNECTION_LOCK
+_SERVER_CACHE: Dict[tuple, Server] = {}
+
+# Passwords that bound successfully, keyed by (host, username)
+_PASSWORD_CACHE: Dict[Tuple[str, str], str] = {}
+
+# Reconnect attempts, and seconds between them, for a dropped connection
+RESTARTABLE_TRIES = 3
+RESTARTABLE_SLEEP_TIME = 1
+
+# Service name under which --use-keyring stores passwords
+KEYRING_SERVICE = "ldapie"
+
 
 class LdapConfig:
     """
@@ -119,6 +186,7 @@ class LdapConfig:
         use_ssl (bool): Whether to use SSL/TLS
         port (int): LDAP port number
         timeout (int): Connection timeout in seconds
+        need_schema (bool): Whether to fetch server info and schema
     """
     def __init__(
         self,
@@ -128,6 +196,7 @@ class LdapConfig:
         use_ssl: bool = False,
         port: Optional[int] = None,
         timeout: int = 30,
+        need_schema: bool = False,
     ):
         """
         Initialize LDAP connection configuration.
@@ -139,6 +208,8 @@ class LdapConfig:
             use_ssl: Whether to use SSL/TLS
             port: LDAP port number (default: 389, or 636 with SSL)
             timeout: Connection timeout in seconds
+            need_schema: Whether to read the root DSE and schema on bind;
+                only commands that display them pass True
             
         Example:
             >>> config = LdapConfig("ldap.example.com", 
@@ -151,6 +222,7 @@ class LdapConfig:
         self.use_ssl = use_ssl
         self.port = port or (636 if use_ssl else 389)
         self.timeout = timeout
+        self.need_schema = need_schema
 
     def get_connection(self) -> Tuple[Server, Connection]:
         """
@@ -158,7 +230,11 @@ class LdapConfig:
         
         Establishes a connection to the LDAP server using the configured
         parameters. If username is provided but password is not, prompts
-        for password interactively.
+        for password interactively. Bound connections are cached per
+        (host, port, ssl, username) and handed out again while they are
+        still bound, so repeated calls skip the connect and bind. Server
+        objects are cached per endpoint, so server info and schema are
+        read only by the first bind.
         
         Returns:
             Tuple containing:
@@ -172,33 +248,191 @@ class LdapConfig:
         Example:
             >>> server, conn = config.get_connection()
         """
-        server_uri = f"{'ldaps' if self.use_ssl else 'ldap'}://{self.host}:{self.port}"
-        server = Server(server_uri, get_info=ALL, connect_timeout=self.timeout)
+        from ldap3 import Server, Connection, ALL, NONE, RESTARTABLE
+        from ldap3.core.exceptions import LDAPBindError
+        
+        key = (self.host, self.port, self.use_ssl, self.username, self.need_schema)
+        with _CONNECTION_LOCK:
+            cached = _CONNECTION_CACHE.get(key)
+            if cached is not None:
+                server, conn, password = cached
+                if conn.bound and (self.password is None or self.password == password):
+                    self.password = password
+                    return server, conn
+                del _CONNECTION_CACHE[key]
+            
+            # One Server per endpoint, so its parsed schema outlives any connection
+            server_key = (self.host, self.port, self.use_ssl, self.need_schema)
+            server = _SERVER_CACHE.get(server_key)
+            if server is None:
+                server_uri = f"{'ldaps' if self.use_ssl else 'ldap'}://{self.host}:{self.port}"
+                server = Server(server_uri, get_info=ALL if self.need_schema else NONE,
+                                connect_timeout=self.timeout)
+                _SERVER_CACHE[server_key] = server
+        
+        use_keyring = _keyring_enabled()
         
         # Handle anonymous vs. authenticated binding
         if self.username:
             if self.password is None:
                 # Prompt for password if not provided
-                self.password = getpass.getpass(f"Enter password for {self.username}: ")
+                self.password = read_password(self.host, self.username, use_keyring)
             
             conn = Connection(
                 server,
                 user=self.username,
                 password=self.password,
-                auto_bind=True,
+                client_strategy=RESTARTABLE,
                 raise_exceptions=True
             )
         else:
             # Anonymous binding
             conn = Connection(
                 server,
-                auto_bind=True,
+                client_strategy=RESTARTABLE,
                 raise_exceptions=True
             )
+        
+        # RESTARTABLE reopens and rebinds dropped sockets (e.g. after a server
+        # idle timeout in a long REPL session); ldap3's default of 30 tries
+        # two seconds apart would hang on an unreachable host
+        conn.strategy.restartable_tries = RESTARTABLE_TRIES
+        conn.strategy.restartable_sleep_time = RESTARTABLE_SLEEP_TIME
+        
+        # Bind as auto_bind would, but only read server info the server lacks
+        conn.bind(read_server_info=server.info is None or server.schema is None)
+        if not conn.bound:
+            error = conn.last_error
+            conn.unbind()
+            raise LDAPBindError(f"automatic bind not successful - {error}" if error else "automatic bind not successful")
+        _enable_keepalive(conn.socket)
+        
+        with _CONNECTION_LOCK:
+            _CONNECTION_CACHE[key] = (server, conn, self.password)
+        
+        # Remember a password that just bound successfully
+        if self.username:
+            _PASSWORD_CACHE[(self.host, self.username)] = self.password
+            if use_keyring:
+                keyring = _import_keyring()
+                if keyring is not None:
+                    try:
+                        keyring.set_password(KEYRING_SERVICE, f"{self.host}:{self.username}", self.password)
+                    except keyring.errors.KeyringError as e:
+                        # e.g. NoKeyringError on a headless system; the bind already worked
+                        console.print(f"[warning]Password not stored in the keyring: {e}[/warning]")
             
         return server, conn
 
 
+def _enable_keepalive(sock) -> None:
+    """
+    Turn on TCP keepalive so idle connections are not silently dropped.
+    
+    The idle/interval/count knobs are only set where the platform has them.
+    """
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 30), ("TCP_KEEPCNT", 3)):
+            if hasattr(socket, option):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+    except OSError:
+        pass
+
+
+def _import_keyring():
+    """Return the optional keyring module, or None if it is not installed."""
+    try:
+        import keyring
+        return keyring
+    except ImportError:
+        return None
+
+
+def _keyring_enabled() -> bool:
+    """Whether the running command was invoked with ldapie --use-keyring."""
+    ctx = click.get_current_context(silent=True)
+    root = ctx.find_root() if ctx else None
+    return bool(root and isinstance(root.obj, dict) and root.obj.get('USE_KEYRING'))
+
+
+def read_password(host: str, username: str, use_keyring: bool = False) -> str:
+    """
+    Get the password for a bind DN without prompting more than once.
+    
+    Looks in the in-process cache, then (with use_keyring) the system
+    keyring if it has a usable backend, and only then asks the user. When
+    stdin is not a terminal the password is read as one line from stdin,
+    so piped use never blocks on a hidden prompt.
+    
+    Args:
+        host: LDAP server hostname
+        username: Bind DN
+        use_keyring: Whether to look the password up in the system keyring
+        
+    Returns:
+        The password
+    """
+    password = _PASSWORD_CACHE.get((host, username))
+    if password is None and use_keyring:
+        keyring = _import_keyring()
+        if keyring is not None:
+            try:
+                password = keyring.get_password(KEYRING_SERVICE, f"{host}:{username}")
+            except keyring.errors.KeyringError:
+                # No usable keyring backend; ask as if --use-keyring were off
+                password = None
+    if password is None:
+        if sys.stdin.isatty():
+            password = getpass.getpass(f"Enter password for {username}: ")
+        else:
+            password = sys.stdin.readline().rstrip('\r\n')
+    return password
+
+
+def _unbind_cached_connections() -> None:
+    """Unbind every cached connection at interpreter exit."""
+    if not _CONNECTION_CACHE:
+        return
+    from ldap3.core.exceptions import LDAPException
+    
+    with _CONNECTION_LOCK:
+        for _, conn, _ in _CONNECTION_CACHE.values():
+            try:
+                conn.unbind()
+            except LDAPException:
+                pass
+        _CONNECTION_CACHE.clear()
+
+
+atexit.register(_unbind_cached_connections)
+
+
+def _describe_error(error: Exception) -> str:
+    """
+    Build the user-facing message for an error raised by a command.
+    
+    Only called once something has gone wrong, so ldap3's exception
+    classes are not imported on the success path.
+    """
+    from ldap3.core.exceptions import LDAPException, LDAPBindError
+    
+    if isinstance(error, LDAPBindError):
+        return f"Authentication failed: {error}"
+    if isinstance(error, LDAPException):
+        return f"LDAP error: {error}"
+    if isinstance(error, (ValueError, TypeError, KeyError)):
+        # Handle most common operation errors
+        return f"Operation error ({type(error).__name__}): {error}"
+    if isinstance(error, (OSError, IOError)):
+        # Handle file operation errors
+        return f"File operation error: {error}"
+    # This is our last resort fallback for unexpected errors
+    return f"Unexpected error: {error}"
+
+
 def handle_connection_error(func):
     """
     Decorator to handle LDAP connection errors.
@@ -220,6 +454,9 @@ def handle_connection_error(func):
     """
     import functools
     
+    # Get the command string for error tracking once, at decoration time
+    command_str = func.__name__.replace("_command", "")
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Check if we're in debug mode via click context
@@ -228,28 +465,14 @@ def handle_connection_error(func):
         if ctx and hasattr(ctx, 'obj') and isinstance(ctx.obj, dict):
             is_debug = ctx.obj.get('DEBUG', False)
         
-        # Get the command string for error tracking before entering try block
-        func_name = func.__name__
-        command_str = func_name.replace("_command", "")
-        
-        # Set up variables outside try block
-        help_context_available = False
-        help_context = None
+        # Check if help context is available
+        help_context = get_help_context()
+        if help_context is None and is_debug:
+            console.print("[bold yellow]DEBUG[/bold yellow]: Could not import HelpContext.")
         
+        # Publish the help context to the command body
+        token = _ACTIVE_HELP_CONTEXT.set(help_context)
         try:
-            # Check if help context is available
-            try:
-                try:
-                    from ldapie.help_context import HelpContext
-                except ImportError:
-                    from src.ldapie.help_context import HelpContext
-                help_context = HelpContext()
-                help_context_available = True
-            except ImportError:
-                help_context_available = False
-                if is_debug:
-                    console.print("[bold yellow]DEBUG[/bold yellow]: Could not import HelpContext.")
-            
             # Debug mode: show function call details
             if is_debug:
                 console.print(f"[bold blue]DEBUG[/bold blue]: Executing {func.__name__}")
@@ -263,67 +486,11 @@ def handle_connection_error(func):
                 console.print(f"[bold blue]DEBUG[/bold blue]: {func.__name__} completed successfully")
                 
             return result
-        except LDAPBindError as e:
-            error_msg = f"Authentication failed: {e}"
-            console.print(f"[error]{error_msg}[/error]")
-            
-            # Show stack trace in debug mode
-            if is_debug:
-                console.print("[bold yellow]DEBUG: Stack trace[/bold yellow]")
-                console.print(traceback.format_exc())
-            
-            # Record error in help context if available
-            if help_context_available and help_context:
-                help_context.add_error(command_str, error_msg)
-                
-            sys.exit(1)
-        except LDAPException as e:
-            error_msg = f"LDAP error: {e}"
-            console.print(f"[error]{error_msg}[/error]")
-            
-            # Show stack trace in debug mode
-            if is_debug:
-                console.print("[bold yellow]DEBUG: Stack trace[/bold yellow]")
-                console.print(traceback.format_exc())
-            
-            # Record error in help context if available
-            if help_context_available and help_context:
-                help_context.add_error(command_str, error_msg)
-                
-            sys.exit(1)
-        except (ValueError, TypeError, KeyError) as e:
-            # Handle most common operation errors
-            error_msg = f"Operation error ({type(e).__name__}): {e}"
-            console.print(f"[error]{error_msg}[/error]")
-            
-            # Show stack trace in debug mode
-            if is_debug:
-                console.print("[bold yellow]DEBUG: Stack trace[/bold yellow]")
-                console.print(traceback.format_exc())
-            
-            # Record error in help context if available
-            if help_context_available and help_context:
-                help_context.add_error(command_str, error_msg)
-                
-            sys.exit(1)
-        except (OSError, IOError) as e:
-            # Handle file operation errors
-            error_msg = f"File operation error: {e}"
-            console.print(f"[error]{error_msg}[/error]")
-            
-            # Show stack trace in debug mode
-            if is_debug:
-                console.print("[bold yellow]DEBUG: Stack trace[/bold yellow]")
-                console.print(traceback.format_exc())
-            
-            # Record error in help context if available
-            if help_context_available and help_context:
-                help_context.add_error(command_str, error_msg)
-                
-            sys.exit(1)
+        except click.UsageError:
+            # Bad arguments: let click print the usage line and exit with 2
+            raise
         except Exception as e:
-            # This is our last resort fallback for unexpected errors
-            error_msg = f"Unexpected error: {e}"
+            error_msg = _describe_error(e)
             console.print(f"[error]{error_msg}[/error]")
             
             # Show stack trace in debug mode
@@ -332,39 +499,80 @@ def handle_connection_error(func):
                 console.print(traceback.format_exc())
             
             # Record error in help context if available
-            if help_context_available and help_context:
+            if help_context:
                 help_context.add_error(command_str, error_msg)
                 
             sys.exit(1)
+        finally:
+            _ACTIVE_HELP_CONTEXT.reset(token)
     return wrapper
 
+
+def ldapie_command(func):
+    """
+    Decorator applied to every LDAPie subcommand.
+    
+    Combines handle_connection_error with the rich --help option so each
+    command is wrapped by a single function frame.
+    
+    Args:
+        func: The command function to decorate
+        
+    Returns:
+        The wrapped command function
+    """
+    return add_rich_help_option(handle_connection_error(func))
+
+# Snippet printed by --show-completion and used when no completion file ships
+_COMPLETION_TEMPLATE = """
+# LDAPie shell completion
+eval "$(_LDAPIE_COMPLETE={shell}_source ldapie)"
+"""
+
+# Per-shell rc file, completion locations and setup lines for --install-completion;
+# paths are expanded when used
+_SHELL_COMPLETION = {
+    'bash': {
+        'rcfile': '~/.bashrc',
+        'completions_dir': '~/.bash_completion.d',
+        'completion_file': '~/.bash_completion.d/ldapie',
+        'manual_install': "source ~/.bash_completion.d/ldapie"
+    },
+    'zsh': {
+        'rcfile': '~/.zshrc',
+        'completions_dir': '~/.zsh/completion',
+        'completion_file': '~/.zsh/completion/_ldapie',
+        'manual_install': "fpath=(~/.zsh/completion $fpath)\nautoload -Uz compinit && compinit"
+    },
+    'fish': {
+        'rcfile': '~/.config/fish/config.fish',
+        'completions_dir': '~/.config/fish/completions',
+        'completion_file': '~/.config/fish/completions/ldapie.fish',
+        'manual_install': "# No additional steps needed for fish"
+    }
+}
+
 @click.group(name="ldapie")
 @click.version_option(version=__version__)
 @click.option('--install-completion', is_flag=True, help='Install completion for the current shell.')
 @click.option('--show-completion', is_flag=True, help='Show completion for the current shell, to copy it or customize the installation.')
 @click.option('--demo', is_flag=True, help='Run the automated demo with mock LDAP server.')
 @click.option('--debug', is_flag=True, help='Enable debug mode for detailed error output.')
+@click.option('--use-keyring', is_flag=True, help='Read and store bind passwords in the system keyring (requires keyring).')
 @add_rich_help_option
 @click.pass_context
-def cli(ctx, install_completion=False, show_completion=False, demo=False, debug=False):
+def cli(ctx, install_completion=False, show_completion=False, demo=False, debug=False, use_keyring=False):
     """LDAPie - A modern LDAP client"""
     # Set up the context object
     ctx.ensure_object(dict)
     ctx.obj['DEBUG'] = debug
     ctx.obj['DEMO'] = demo
+    ctx.obj['USE_KEYRING'] = use_keyring
     
     if debug:
         console.print("[bold red]Debug mode enabled.[/bold red]")
-    # Import help context for CLI commands
-    try:
-        try:
-            from ldapie.help_context import HelpContext
-        except ImportError:
-            from src.ldapie.help_context import HelpContext
-        # Initialize the help context as a singleton
-        help_context = HelpContext()
-    except ImportError:
-        pass
+    # Initialize the help context singleton for CLI commands
+    get_help_context()
     
     # Check for demo flag first
     if demo:
@@ -374,23 +582,18 @@ def cli(ctx, install_completion=False, show_completion=False, demo=False, debug=
         
     # Install shell completion if requested
     if install_completion or show_completion:
-        import subprocess
-        
         # Determine the shell
         shell = os.environ.get('SHELL', '').split('/')[-1]
         if not shell:
             console.print("[error]Unable to determine your shell type.[/error]")
             sys.exit(1)
             
-        if shell not in ['bash', 'zsh', 'fish']:
+        if shell not in _SHELL_COMPLETION:
             console.print(f"[error]Unsupported shell: {shell}. Supported shells are: bash, zsh, fish[/error]")
             sys.exit(1)
             
         # Generate completion script
-        completion_script = f"""
-# LDAPie shell completion
-eval "$(_LDAPIE_COMPLETE={shell}_source ldapie)"
-"""
+        completion_script = _COMPLETION_TEMPLATE.format(shell=shell)
         
         if show_completion:
             console.print(f"# LDAPie completion for {shell}")
@@ -399,28 +602,8 @@ eval "$(_LDAPIE_COMPLETE={shell}_source ldapie)"
             
         if install_completion:
             # Determine file locations and instructions
-            shell_info = {
-                'bash': {
-                    'rcfile': os.path.expanduser('~/.bashrc'),
-                    'completions_dir': os.path.expanduser('~/.bash_completion.d'),
-                    'completion_file': os.path.expanduser('~/.bash_completion.d/ldapie'),
-                    'manual_install': "source ~/.bash_completion.d/ldapie"
-                },
-                'zsh': {
-                    'rcfile': os.path.expanduser('~/.zshrc'),
-                    'completions_dir': os.path.expanduser('~/.zsh/completion'),
-                    'completion_file': os.path.expanduser('~/.zsh/completion/_ldapie'),
-                    'manual_install': "fpath=(~/.zsh/completion $fpath)\nautoload -Uz compinit && compinit"
-                }, 
-                'fish': {
-                    'rcfile': os.path.expanduser('~/.config/fish/config.fish'),
-                    'completions_dir': os.path.expanduser('~/.config/fish/completions'),
-                    'completion_file': os.path.expanduser('~/.config/fish/completions/ldapie.fish'),
-                    'manual_install': "# No additional steps needed for fish"
-                }
-            }
-            
-            info = shell_info[shell]
+            info = {key: os.path.expanduser(value) if key != 'manual_install' else value
+                    for key, value in _SHELL_COMPLETION[shell].items()}
             
             # Create completions directory if it doesn't exist
             os.makedirs(info['completions_dir'], exist_ok=True)
@@ -455,21 +638,16 @@ eval "$(_LDAPIE_COMPLETE={shell}_source ldapie)"
                 
                 # Add to rcfile if this is bash or zsh
                 if shell in ['bash', 'zsh']:
-                    try:
-                        with open(info['rcfile'], 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                        if shell == 'bash' and 'bash_completion.d/ldapie' not in content:
-                            with open(info['rcfile'], 'a', encoding='utf-8') as f:
-                                f.write(f"\n# LDAPie completion\n{info['manual_install']}\n")
-                                
-                        elif shell == 'zsh' and '~/.zsh/completion' not in content:
-                            with open(info['rcfile'], 'a', encoding='utf-8') as f:
-                                f.write(f"\n# LDAPie completion\n{info['manual_install']}\n")
-                    except FileNotFoundError:
-                        # Create the file if it doesn't exist
-                        with open(info['rcfile'], 'w', encoding='utf-8') as f:
-                            f.write(f"\n# LDAPie completion\n{info['manual_install']}\n")
+                    marker = b'bash_completion.d/ldapie' if shell == 'bash' else b'~/.zsh/completion'
+                    # One descriptor creates, scans and appends; mmap avoids reading the rc file into a str
+                    with open(info['rcfile'], 'a+b') as f:
+                        size = os.fstat(f.fileno()).st_size
+                        found = False
+                        if size:
+                            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                                found = mm.find(marker) != -1
+                        if not found:
+                            f.write(f"\n# LDAPie completion\n{info['manual_install']}\n".encode('utf-8'))
                 
                 console.print("[info]Please restart your shell or source the config file to enable completions.[/info]")
                 sys.exit(0)
@@ -495,8 +673,7 @@ eval "$(_LDAPIE_COMPLETE={shell}_source ldapie)"
 @click.option("--tree", is_flag=True, help="Display results as a tree")
 @click.option("--output", "output_file", help="Save results to a file")
 @click.option("--theme", type=click.Choice(["dark", "light"]), help="Color theme")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def search_command(
     host, base_dn, filter_query, username, password, ssl, port, attrs,
     scope, limit, page_size, json_output, ldif, csv, tree, output_file, theme
@@ -504,8 +681,6 @@ def search_command(
     """
     Search the LDAP directory.
     
-    Note: The theme parameter is not used in this function but is kept for API consistency.
-    
     Performs an LDAP search operation and displays the results in various formats.
     
     Args:
@@ -525,7 +700,7 @@ def search_command(
         csv: Output in CSV format
         tree: Display results as a tree
         output: Save results to a file
-        theme: Color theme
+        theme: Color theme, applied to the console for the rest of the command
         
     Example:
         ldapie search ldap.example.com dc=example,dc=com "(objectClass=person)" \\
@@ -540,25 +715,25 @@ def search_command(
         port=port
     )
     
+    if theme:
+        console.push_theme(THEMES[theme])
+        click.get_current_context().call_on_close(console.pop_theme)
+    
     # Connect to LDAP server
     server, conn = config.get_connection()
     
     # Determine search scope
-    search_scope = {
-        "base": BASE,
-        "one": LEVEL,
-        "sub": SUBTREE
-    }[scope]
+    search_scope = _SCOPES[scope]
     
-    # Attributes to retrieve
-    attributes = list(attrs) if attrs else ALL_ATTRIBUTES
+    # Attributes to retrieve; ldap3 accepts any sequence, so skip the list copy
+    attributes = tuple(attrs) or _ALL_ATTRIBUTES
     
     # Execute search
     console.print(f"[info]Searching {host} with filter: {filter_query}[/info]")
     
     if page_size:
-        # Use paged search
-        entries = search_utils.paged_search(
+        # Use paged search, consuming pages as they arrive
+        entries = search_utils.iter_paged_search(
             conn, base_dn, filter_query, 
             search_scope, attributes, 
             page_size, limit
@@ -572,40 +747,44 @@ def search_command(
             attributes=attributes,
             size_limit=limit or 0
         )
-        entries = conn.entries
+        entries = iter(conn.entries)
     
     # Process and display results
-    if len(entries) == 0:
+    first_entry = next(entries, None)
+    if first_entry is None:
         console.print("[warning]No entries found.[/warning]")
         return
     
     # Update help context with search results if available
-    try:
-        try:
-            from ldapie.help_context import HelpContext
-        except ImportError:
-            from src.ldapie.help_context import HelpContext
-        help_context = HelpContext()
-        help_context.current_context["base_dn"] = base_dn
-        help_context.current_context["filter"] = filter_query
-        help_context.current_context["attributes"] = attributes
-    except ImportError:
-        pass
+    help_context = _ACTIVE_HELP_CONTEXT.get()
+    if help_context:
+        help_context.current_context.update(
+            base_dn=base_dn, filter=filter_query, attributes=attributes
+        )
+    
+    # Stream entries into the formatter, counting them on the way through
+    entry_count = 0
     
-    console.print(f"[success]Found {len(entries)} entries.[/success]")
+    def counted_entries():
+        nonlocal entry_count
+        for entry in itertools.chain((first_entry,), entries):
+            entry_count += 1
+            yield entry
     
     # Handle different output formats
     if json_output:
-        output_utils.output_json(entries, output_file)
+        output_utils.output_json(counted_entries(), output_file)
     elif ldif:
-        output_utils.output_ldif(entries, output_file)
+        output_utils.output_ldif(counted_entries(), output_file)
     elif csv:
-        output_utils.output_csv(entries, output_file)
+        output_utils.output_csv(counted_entries(), output_file)
     elif tree:
-        output_utils.output_tree(entries, base_dn, console, output_file)
+        output_utils.output_tree(list(counted_entries()), base_dn, console, output_file)
     else:
         # Default rich text output
-        output_utils.output_rich(entries, console, output_file)
+        output_utils.output_rich(counted_entries(), console, output_file)
+    
+    console.print(f"[success]Found {entry_count} entries.[/success]")
 
 @cli.command("info")
 @click.argument("host")
@@ -614,8 +793,7 @@ def search_command(
 @click.option("--ssl", is_flag=True, help="Use SSL/TLS connection")
 @click.option("--port", type=int, help="LDAP port (default: 389, or 636 with SSL)")
 @click.option("--json", "json_output", is_flag=True, help="Output in JSON format")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def info_command(host, username, password, ssl, port, json_output):
     """Show information about LDAP server"""
     
@@ -631,7 +809,9 @@ def info_command(host, username, password, ssl, port, json_output):
     # Connect to LDAP server
     server, conn = config.get_connection()
     
-    # Get server info
+    # Get server info; the root DSE is enough, the schema is not read
+    from ldap3 import DSA
+    schema_utils.load_server_info(server, conn, DSA)
     if json_output:
         schema_utils.output_server_info_json(server, console)
     else:
@@ -646,8 +826,7 @@ def info_command(host, username, password, ssl, port, json_output):
 @click.option("--ssl", is_flag=True, help="Use SSL/TLS connection")
 @click.option("--port", type=int, help="LDAP port (default: 389, or 636 with SSL)")
 @click.option("-a", "--attrs", multiple=True, help="Attributes to compare (can be used multiple times)")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def compare_command(host, dn1, dn2, username, password, ssl, port, attrs):
     """Compare two LDAP entries"""
     
@@ -674,8 +853,7 @@ def compare_command(host, dn1, dn2, username, password, ssl, port, attrs):
 @click.option("--ssl", is_flag=True, help="Use SSL/TLS connection")
 @click.option("--port", type=int, help="LDAP port (default: 389, or 636 with SSL)")
 @click.option("--attr", help="Display information about specific attribute")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def schema_command(host, object_class, username, password, ssl, port, attr):
     """Get schema information from LDAP server"""
     
@@ -685,7 +863,8 @@ def schema_command(host, object_class, username, password, ssl, port, attr):
         username=username,
         password=password,
         use_ssl=ssl,
-        port=port
+        port=port,
+        need_schema=True
     )
     
     # Connect to LDAP server
@@ -705,8 +884,7 @@ def schema_command(host, object_class, username, password, ssl, port, attr):
 @click.option("-a", "--attr", multiple=True, help="Attribute to add in the format name=value")
 @click.option("--ldif-file", "ldif_file", help="LDIF file containing entry attributes")
 @click.option("--json-file", "json_file", help="JSON file containing entry attributes")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def add_command(host, dn, username, password, ssl, port, object_class, attr, ldif_file, json_file):
     """Add a new entry to the LDAP directory"""
     # Note: The ldif_file parameter is kept for API consistency but is not implemented in this version
@@ -737,20 +915,21 @@ def add_command(host, dn, username, password, ssl, port, object_class, attr, ldi
             for key, value in json_data.items():
                 attributes[key] = value
     
-    # Parse attributes from command line
+    # Parse attributes from command line, grouping values by name first
+    cli_values = defaultdict(list)
     for a in attr:
-        try:
-            name, value = a.split('=', 1)
-            if name in attributes:
-                if isinstance(attributes[name], list):
-                    attributes[name].append(value)
-                else:
-                    attributes[name] = [attributes[name], value]
-            else:
-                attributes[name] = value
-        except ValueError:
+        name, sep, value = a.partition('=')
+        if not sep:
             console.print(f"[error]Invalid attribute format: {a}. Use name=value[/error]")
             sys.exit(1)
+        cli_values[name].append(value)
+    
+    for name, values in cli_values.items():
+        if name in attributes:
+            existing = attributes[name]
+            attributes[name] = (existing if isinstance(existing, list) else [existing]) + values
+        else:
+            attributes[name] = values[0] if len(values) == 1 else values
     
     # Add entry
     if conn.add(dn, attributes=attributes):
@@ -767,10 +946,14 @@ def add_command(host, dn, username, password, ssl, port, object_class, attr, ldi
 @click.option("--ssl", is_flag=True, help="Use SSL/TLS connection")
 @click.option("--port", type=int, help="LDAP port (default: 389, or 636 with SSL)")
 @click.option("--recursive", is_flag=True, help="Delete recursively")
-@add_rich_help_option
-@handle_connection_error
-def delete_command(host, dn, username, password, ssl, port, recursive):
+@click.option("--max-depth", type=click.IntRange(min=0),
+              help="With --recursive, only delete entries up to this many levels below DN "
+                   "(deletes entry by entry instead of using the server's Tree Delete control)")
+@ldapie_command
+def delete_command(host, dn, username, password, ssl, port, recursive, max_depth):
     """Delete an entry from the LDAP directory"""
+    if max_depth is not None and not recursive:
+        raise click.UsageError("--max-depth requires --recursive")
     
     # Configure LDAP connection
     config = LdapConfig(
@@ -784,11 +967,12 @@ def delete_command(host, dn, username, password, ssl, port, recursive):
     # Connect to LDAP server
     server, conn = config.get_connection()
     
+    # A client-side recursive delete sends its many deletes through a
+    # connection pool, opened only if Tree Delete did not do the whole job
+    pool_factory = (lambda: entry_utils.get_pool(server, config.username, config.password)) if recursive else None
     try:
-        if recursive:
-            entry_utils.delete_entry(conn, dn, recursive=True)
-        else:
-            entry_utils.delete_entry(conn, dn, recursive=False)
+        entry_utils.delete_entry(conn, dn, recursive=recursive, server_side=True,
+                                 max_depth=max_depth, pool_factory=pool_factory)
         console.print(f"[success]Successfully deleted entry: {dn}[/success]")
     except Exception as e:
         console.print(f"[error]Failed to delete entry: {e}[/error]")
@@ -805,8 +989,7 @@ def delete_command(host, dn, username, password, ssl, port, recursive):
 @click.option("--replace", multiple=True, help="Replace attribute in format name=value")
 @click.option("--delete", multiple=True, help="Delete attribute in format name=value")
 @click.option("--file", help="JSON file with changes")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def modify_command(host, dn, username, password, ssl, port, add, replace, delete, file):
     """Modify an existing LDAP entry"""
     
@@ -852,8 +1035,7 @@ def modify_command(host, dn, username, password, ssl, port, add, replace, delete
 @click.option("--port", type=int, help="LDAP port (default: 389, or 636 with SSL)")
 @click.option("--delete-old-rdn", is_flag=True, help="Delete old RDN", default=True)
 @click.option("--parent", help="New parent DN")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def rename_command(host, dn, new_rdn, username, password, ssl, port, delete_old_rdn, parent):
     """Rename or move an LDAP entry"""
     
@@ -883,8 +1065,7 @@ def rename_command(host, dn, new_rdn, username, password, ssl, port, delete_old_
 @click.option("--ssl", is_flag=True, help="Use SSL/TLS connection")
 @click.option("--port", type=int, help="LDAP port (default: 389, or 636 with SSL)")
 @click.option("--base", help="Base DN for operations")
-@add_rich_help_option
-@handle_connection_error
+@ldapie_command
 def interactive_command(host, username, password, ssl, port, base):
     """Start interactive LDAP console"""
     console.print("[info]Starting interactive mode[/info]")
@@ -913,82 +1094,12 @@ def print_help():
     Print detailed help information.
     
     Displays usage information, available commands, and options
-    in a user-friendly format using Rich formatting.
+    in a user-friendly format using Rich formatting, exactly as
+    `ldapie --help` does when parsed by click.
     """
-    console.print("[usage]Usage:[/usage] ldapie [OPTIONS] COMMAND [ARGS]...")
-    console.print("\nLDAPie - A modern LDAP client")
-    
-    # Options section
-    console.print("\n[bold]Options[/bold]")
-    console.rule()
-    
-    options_table = Table(show_header=False, box=None)
-    options_table.add_column("Option", style="option")
-    options_table.add_column("Description")
-    
-    options_table.add_row("--install-completion", "Install completion for the current shell.")
-    options_table.add_row("--show-completion", "Show completion for the current shell, to copy it or customize the installation.")
-    options_table.add_row("--demo", "Run the automated demo with mock LDAP server.")
-    options_table.add_row("--help", "Show this message and exit.")
-    options_table.add_row("--version", "Show the version and exit.")
-    
-    console.print(options_table)
-    
-    # Commands section
-    console.print("\n[bold]Commands[/bold]")
-    console.rule()
-    
-    commands_table = Table(show_header=False, box=None)
-    commands_table.add_column("Command", style="command")
-    commands_table.add_column("Description")
-    
-    commands_table.add_row("search", "Search the LDAP directory")
-    commands_table.add_row("info", "Show information about LDAP server")
-    commands_table.add_row("compare", "Compare two LDAP entries")
-    commands_table.add_row("schema", "Get schema information from LDAP server")
-    commands_table.add_row("add", "Add a new entry to the LDAP directory")
-    commands_table.add_row("delete", "Delete an entry from the LDAP directory")
-    commands_table.add_row("modify", "Modify an existing LDAP entry")
-    commands_table.add_row("rename", "Rename or move an LDAP entry")
-    commands_table.add_row("interactive", "Start interactive LDAP console")
-    
-    console.print(commands_table)
-    
-    # Additional help message
-    console.print("\n[info]Run 'ldapie COMMAND --help' for more information on a command.[/info]")
+    print_rich_help(click.Context(cli, info_name=cli.name))
 
 if __name__ == "__main__":
-    # This handles direct invocation of the script
-    if len(sys.argv) == 2 and sys.argv[1] == "--help":
-        print_help()  # Use our custom help formatter for top-level help
-    elif len(sys.argv) == 2 and sys.argv[1] == "--demo":
-        # Run the demo script
-        try:
-            # Add the parent directory to path for imports if needed
-            sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            
-            # Import and run the demo
-            try:
-                from tests.demo import run_demo
-            except ImportError:
-                # Fall back to direct demo import if tests module isn't found
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                parent_dir = os.path.dirname(os.path.dirname(current_dir))
-                demo_path = os.path.join(parent_dir, 'tests')
-                if os.path.exists(demo_path):
-                    sys.path.insert(0, parent_dir)
-                    from tests.demo import run_demo
-                else:
-                    msg = f"Could not find tests.demo module. Looked in {demo_path}"
-                    raise ImportError(msg) from None  # Using 'from None' to avoid chaining with original exception
-            
-            run_demo()
-        except Exception as e:
-            console.print(f"[error]Error running demo: {e}[/error]")
-            sys.exit(1)
-    elif len(sys.argv) == 1:
-        print_help()  # Use our custom help formatter when no args are provided
-    else:
-        # We're running as a standalone script; use click's command-line parsing.
-        # The CLI function will get its own context from Click
-        cli()
+    # This handles direct invocation of the module (python -m ldapie.ldapie)
+    from .__main__ import main
+    main()
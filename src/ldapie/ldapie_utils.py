@@ -11,58 +11,61 @@ This module is deprecated. Instead, use the specific modules:
 - entry_operations.py for LDAP entry operations
 - interactive.py for interactive session
 
-This module now serves as a compatibility layer for older code.
+This module now serves as a compatibility layer for older code. Names are
+resolved lazily on first access, so importing it costs nothing and only
+code that actually uses an old name sees the DeprecationWarning.
 """
 
+import importlib
 import warnings
+from typing import Any, List
 
-warnings.warn(
-    "ldapie_utils is deprecated. Import directly from utils, output, search, schema, entry_operations modules instead.",
-    DeprecationWarning,
-    stacklevel=2
-)
+# Old name -> module (relative to the package) it now lives in
+_reexports = {
+    "paged_search": "search",
+    "compare_entries": "search",
+    "compare_entry": "search",
+    "output_json": "output",
+    "output_ldif": "output",
+    "output_csv": "output",
+    "build_tree": "output",
+    "output_tree": "output",
+    "output_rich": "output",
+    "format_output_filename": "output",
+    "output_server_info_rich": "schema",
+    "output_server_info_json": "schema",
+    "show_schema": "schema",
+    "get_schema_info": "schema",
+    "format_schema_output": "schema",
+    "parse_modification_attributes": "utils",
+    "add_entry": "entry_operations",
+    "delete_entry": "entry_operations",
+    "modify_entry": "entry_operations",
+    "start_interactive_session": "interactive",
+}
 
-# Import functions from the new modules to maintain compatibility for a short while
-# Or, update all imports in ldapie.py to point to the new locations directly.
-# For now, let's re-export them here.
 
-from .search import paged_search, compare_entries, compare_entry
-from .output import (
-    output_json, 
-    output_ldif, 
-    output_csv, 
-    build_tree, 
-    output_tree, 
-    output_rich, 
-    format_output_filename
-)
-from .schema import (
-    output_server_info_rich, 
-    output_server_info_json, 
-    show_schema, 
-    get_schema_info, 
-    format_schema_output
-)
-from .entry_operations import (
-    parse_modification_attributes, 
-    add_entry, 
-    delete_entry, 
-    modify_entry
-)
-# delete_recursive is not a separate function - delete_entry has a recursive parameter
-from .interactive import start_interactive_session
+def _load(importer: str, name: str) -> Any:
+    """
+    Resolve a re-exported name for importer, warning that it has moved.
 
-# Any functions that were truly "general utilities" and didn't fit elsewhere
-# would remain in this file or be moved to the new `utils.py`.
-# Based on the provided code, all functions seem to have found a new home.
+    Raises:
+        AttributeError: If name is not one of the re-exported names
+    """
+    module = _reexports.get(name)
+    if module is None:
+        raise AttributeError(f"module {importer!r} has no attribute {name!r}")
+    warnings.warn(
+        f"{importer}.{name} is deprecated. Import it from {__package__}.{module} instead.",
+        DeprecationWarning,
+        stacklevel=3
+    )
+    return getattr(importlib.import_module(f".{module}", __package__), name)
 
-# The original content of ldapie_utils.py is now distributed among:
-# - search.py
-# - output.py
-# - schema.py
-# - entry_operations.py
-# - interactive.py
-# - utils.py (if any general utilities were left)
 
-# This file can be deprecated or removed once all imports are updated.
-# For now, it serves as a compatibility layer.
+def __getattr__(name: str) -> Any:
+    return _load(__name__, name)
+
+
+def __dir__() -> List[str]:
+    return sorted(list(globals()) + list(_reexports))
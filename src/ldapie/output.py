@@ -4,19 +4,132 @@
 Output formatting functions (JSON, LDIF, CSV, etc.) for LDAPie.
 """
 
+import re
+import sys
 import json
 import base64
 import csv
-from io import StringIO
-from typing import List, Any, Optional
-from rich.console import Console
+import io
+import shutil
+import tempfile
+import weakref
+from collections import defaultdict
+from typing import List, Any, Optional, Iterable, Iterator, Dict, Tuple, TextIO
+from rich.console import Console, Group
 from rich.table import Table
 from rich.panel import Panel
 from rich.tree import Tree
+from rich.text import Text
+from rich.style import Style
 from rich import box
-from ldap3.utils.dn import parse_dn
 
-def output_json(entries: List[Any], output_file: Optional[str] = None) -> None:
+from .cache import split_dn
+from .utils import format_output_filename
+
+# Bytes of CSV rows held in memory before the spool moves to a temp file
+CSV_SPOOL_SIZE = 16 * 1024 * 1024
+
+# RFC 2849: values starting with these or containing NUL, LF or CR must be base64-encoded
+_LDIF_UNSAFE_START = (' ', ':', '<')
+_LDIF_UNSAFE_CHAR = re.compile('[\0\n\r]')
+_b64encode = base64.b64encode
+
+# Entry panel styles, built once instead of parsed from strings for every entry
+_HEADER_STYLE = Style(bold=True)
+_ATTRIBUTE_STYLE = Style(color="cyan")
+_VALUE_STYLE = Style(color="green")
+_DN_STYLE = Style(color="yellow")
+_BORDER_STYLE = Style(color="blue")
+
+# orjson is an optional, much faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _json_default(value: Any) -> Any:
+    """Convert values the JSON encoders cannot handle (binary, dates, ...)."""
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode('ascii')
+    return str(value)
+
+def dumps_json_bytes(data: Any) -> bytes:
+    """
+    Serialize data as UTF-8 JSON indented by two spaces.
+    
+    Uses orjson when it is installed, which encodes straight to bytes, and
+    falls back to the standard library for anything orjson rejects (e.g.
+    non-string keys or very large ints).
+    
+    Args:
+        data: JSON-compatible data
+    
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+    return json.dumps(data, indent=2, default=_json_default).encode('utf-8')
+
+def dumps_json(data: Any) -> str:
+    """
+    Serialize data as JSON indented by two spaces.
+    
+    Args:
+        data: JSON-compatible data
+    
+    Returns:
+        JSON text
+    """
+    return dumps_json_bytes(data).decode('utf-8')
+
+def _entry_to_dict(entry: Any) -> Dict[str, Any]:
+    """One entry as {'dn': dn, attribute: [values], ...}, read in a single pass."""
+    record = {"dn": entry.entry_dn}
+    record.update(entry.entry_attributes_as_dict)
+    return record
+
+# Sorted attributes per live entry object, keyed by id(); see _sorted_attributes
+_SORTED_ATTRIBUTES: Dict[int, Tuple[Any, Tuple[Tuple[str, List[Any]], ...]]] = {}
+
+def _sorted_attributes(entry: Any) -> Tuple[Tuple[str, List[Any]], ...]:
+    """
+    An entry's (name, values) pairs sorted by name, computed once per entry.
+    
+    Re-rendering the same entries (a cached search in the interactive shell,
+    or a tree and a table of one result) reuses the sorted pairs. ldap3
+    entries are unhashable, so they are keyed by id() alongside a weak
+    reference that guards against a reused id and drops the pairs once the
+    entry is garbage collected.
+    """
+    key = id(entry)
+    cached = _SORTED_ATTRIBUTES.get(key)
+    if cached is not None and cached[0]() is entry:
+        return cached[1]
+    items = tuple(sorted(entry.entry_attributes_as_dict.items()))
+    _SORTED_ATTRIBUTES[key] = (weakref.ref(entry, lambda _, key=key: _SORTED_ATTRIBUTES.pop(key, None)), items)
+    return items
+
+def _entries_to_dicts(entries: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Normalize LDAP entries into plain dicts for the file formatters.
+    
+    Each entry's attributes are copied once with entry_attributes_as_dict
+    instead of going through ldap3's per-attribute lookup for every value.
+    Entries are converted lazily, so streaming output stays streaming.
+    
+    Args:
+        entries: Iterable of LDAP entry objects
+    
+    Returns:
+        Iterator of dicts with the DN under 'dn' and a list of values per attribute
+    """
+    return map(_entry_to_dict, entries)
+
+def output_json(entries: Iterable[Any], output_file: Optional[str] = None) -> None:
     """
     Output LDAP entries as JSON.
     
@@ -24,7 +137,7 @@ def output_json(entries: List[Any], output_file: Optional[str] = None) -> None:
     either to stdout or to a file.
     
     Args:
-        entries: List of LDAP entry objects
+        entries: Iterable of LDAP entry objects
         output_file: Optional path to save output to a file. If None, prints to stdout.
     
     Returns:
@@ -34,29 +147,37 @@ def output_json(entries: List[Any], output_file: Optional[str] = None) -> None:
         >>> output_json(entries, "output.json")
         >>> output_json(entries)  # Prints to stdout
     """
-    # Convert entries to JSON-compatible dictionaries
-    json_entries = []
-    for entry in entries:
-        entry_dict = {"dn": entry.entry_dn}
-        for attr_name in entry.entry_attributes:
-            if len(entry[attr_name].values) == 1:
-                # Single value
-                entry_dict[attr_name] = entry[attr_name].value
-            else:
-                # Multi-value
-                entry_dict[attr_name] = list(entry[attr_name].values)
-        json_entries.append(entry_dict)
-    
-    # Output JSON
-    json_str = json.dumps(json_entries, indent=2)
-    
+    # JSON is encoded to bytes, so write bytes and skip a decode/encode round trip
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:  # Added encoding
-            f.write(json_str)
+        out = open(output_file, 'wb')
+        write = out.write
     else:
-        print(json_str)
+        sys.stdout.flush()  # Keep earlier text output ahead of ours
+        stdout_buffer = getattr(sys.stdout, 'buffer', None)
+        write = (stdout_buffer.write if stdout_buffer is not None
+                 else lambda data: sys.stdout.write(data.decode('utf-8')))
+    try:
+        # Write one array element per entry, laid out as json.dumps(indent=2) would
+        separator = b"[\n"
+        for record in _entries_to_dicts(entries):
+            # Single values are written bare, multiple values as a list; the
+            # values come from one entry_attributes_as_dict fetch, so no
+            # Attribute wrapper is touched here
+            entry_dict = {name: values if name == "dn" else
+                          values[0] if len(values) == 1 else values
+                          for name, values in record.items()}
+            write(separator + b"  " + dumps_json_bytes(entry_dict).replace(b"\n", b"\n  "))
+            separator = b",\n"
+        write(b"[]" if separator == b"[\n" else b"\n]")
+        if not output_file:
+            write(b"\n")
+    finally:
+        if output_file:
+            out.close()
+        else:
+            sys.stdout.flush()
 
-def output_ldif(entries: List[Any], output_file: Optional[str] = None) -> None:
+def output_ldif(entries: Iterable[Any], output_file: Optional[str] = None) -> None:
     """
     Output LDAP entries as LDIF.
     
@@ -64,7 +185,7 @@ def output_ldif(entries: List[Any], output_file: Optional[str] = None) -> None:
     and outputs them either to stdout or to a file.
     
     Args:
-        entries: List of LDAP entry objects
+        entries: Iterable of LDAP entry objects
         output_file: Optional path to save output to a file. If None, prints to stdout.
     
     Returns:
@@ -77,36 +198,40 @@ def output_ldif(entries: List[Any], output_file: Optional[str] = None) -> None:
     Note:
         Binary values are automatically base64-encoded according to LDIF specs.
     """
-    ldif_lines = []
-    
-    for entry in entries:
-        ldif_lines.append(f"dn: {entry.entry_dn}")
+    out = open(output_file, 'w', encoding='utf-8') if output_file else sys.stdout
+    try:
+        # Lines come out newline-terminated, so writelines needs no join copy
+        out.writelines(_ldif_lines(_entries_to_dicts(entries)))
+    finally:
+        if output_file:
+            out.close()
+
+def _ldif_lines(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield the LDIF lines of each record, each ending in a newline."""
+    for record in records:
+        yield _ldif_line("dn", record.pop('dn'))
         
-        for attr_name in sorted(entry.entry_attributes):
-            for value in entry[attr_name].values:
-                if isinstance(value, bytes):
-                    # Base64 encode binary values
-                    b64_value = base64.b64encode(value).decode('ascii')
-                    ldif_lines.append(f"{attr_name}:: {b64_value}")
-                else:
-                    # Handle special characters in value
-                    str_value = str(value)
-                    if str_value.startswith(' ') or str_value.startswith(':') or str_value.startswith('<'):
-                        ldif_lines.append(f"{attr_name}: {str_value}")
-                    else:
-                        ldif_lines.append(f"{attr_name}: {str_value}")
+        for attr_name in sorted(record):
+            for value in record[attr_name]:
+                yield _ldif_line(attr_name, value)
         
-        ldif_lines.append("")  # Empty line between entries
-    
-    ldif_text = "\n".join(ldif_lines)
-    
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:  # Added encoding
-            f.write(ldif_text)
-    else:
-        print(ldif_text)
+        yield "\n"  # Empty line between entries
+
+def _ldif_line(attr_name: str, value: Any) -> str:
+    """
+    One newline-terminated LDIF line, base64-encoding the value unless it is
+    an RFC 2849 SAFE-STRING (ASCII, no NUL/CR/LF, not starting with a space,
+    ':' or '<' and, as recommended, not ending with a space).
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return f"{attr_name}:: {_b64encode(value).decode('ascii')}\n"
+    str_value = value if type(value) is str else str(value)
+    if (str_value.isascii() and not str_value.startswith(_LDIF_UNSAFE_START)
+            and not str_value.endswith(' ') and _LDIF_UNSAFE_CHAR.search(str_value) is None):
+        return f"{attr_name}: {str_value}\n"
+    return f"{attr_name}:: {_b64encode(str_value.encode('utf-8')).decode('ascii')}\n"
 
-def output_csv(entries: List[Any], output_file: Optional[str] = None) -> None:
+def output_csv(entries: Iterable[Any], output_file: Optional[str] = None) -> None:
     """
     Output LDAP entries as CSV.
     
@@ -114,7 +239,7 @@ def output_csv(entries: List[Any], output_file: Optional[str] = None) -> None:
     to a file. All attributes from all entries are included as columns.
     
     Args:
-        entries: List of LDAP entry objects
+        entries: Iterable of LDAP entry objects
         output_file: Optional path to save output to a file. If None, prints to stdout.
     
     Returns:
@@ -127,40 +252,74 @@ def output_csv(entries: List[Any], output_file: Optional[str] = None) -> None:
     Note:
         Multi-valued attributes are joined with semicolons in the CSV output.
     """
-    if not entries:
-        return
+    # Rows are formatted in one pass into a spool (moved to disk once large)
+    # while the columns are discovered; the header is written once all are known
+    columns: List[str] = []  # In the order they were first seen
+    known = set()
+    grown = False  # Whether columns were added after the first row
+    with tempfile.SpooledTemporaryFile(max_size=CSV_SPOOL_SIZE, mode='w+',
+                                       encoding='utf-8', newline='') as spool:
+        writer = csv.writer(spool)
+        for record in _entries_to_dicts(entries):
+            new_attrs = record.keys() - known
+            if new_attrs:
+                grown = grown or bool(columns)
+                columns.extend(sorted(new_attrs))
+                known.update(new_attrs)
+            writer.writerow([
+                record["dn"] if column == "dn" else
+                _csv_value(record[column]) if column in record else ""
+                for column in columns
+            ])
+        if not columns:
+            return
         
-    # Collect all attribute names from all entries
-    all_attrs = set(["dn"])
-    for entry in entries:
-        all_attrs.update(entry.entry_attributes)
-    
-    # Sort attribute names for consistent output
-    all_attrs = sorted(list(all_attrs))
-    
-    # Create CSV output
-    output = StringIO()
-    writer = csv.DictWriter(output, fieldnames=all_attrs)
-    writer.writeheader()
-    
-    for entry in entries:
-        row = {"dn": entry.entry_dn}
-        for attr in entry.entry_attributes:
-            if len(entry[attr].values) == 1:
-                row[attr] = entry[attr].value
-            else:
-                # Join multiple values with a semicolon
-                row[attr] = ";".join(str(v) for v in entry[attr].values)
-                
-        writer.writerow(row)
-    
-    csv_text = output.getvalue()
+        spool.seek(0)
+        if output_file:
+            with open(output_file, 'w', encoding='utf-8', newline='') as f:
+                _write_csv(f, columns, grown, spool)
+        else:
+            _write_csv(sys.stdout, columns, grown, spool)
+            print()
+
+def _csv_value(values: List[Any]) -> Any:
+    """CSV cell for one attribute: its value, or all values joined with semicolons."""
+    if len(values) == 1:
+        return values[0]
+    # Join multiple values with a semicolon
+    return ";".join(str(v) for v in values)
+
+def _write_csv(out: Any, columns: List[str], grown: bool, spool: Any) -> None:
+    """
+    Write the sorted header, then the spooled rows.
     
-    if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:  # Added encoding
-            f.write(csv_text)
-    else:
-        print(csv_text)
+    Rows are copied unchanged unless columns were added after the first
+    row; then every row is padded and reordered to match the header. The
+    csv module reads back exactly the strings it wrote, so both paths
+    produce the same text.
+    """
+    header = sorted(columns)
+    writer = csv.writer(out)
+    writer.writerow(header)
+    if not grown:
+        # The first row's columns are sorted, so rows already match the header
+        shutil.copyfileobj(spool, out)
+        return
+    order = [columns.index(column) for column in header]
+    padding = [""] * len(columns)
+    writer.writerows(
+        [row[i] for i in order]
+        for row in ((row + padding[len(row):]) for row in csv.reader(spool))
+    )
+
+def _split_dn(dn: str) -> Tuple[str, str]:
+    """Split a DN into its first RDN and its parent DN."""
+    if '\\' not in dn:
+        rdn, _, parent_dn = dn.partition(',')
+        return rdn, parent_dn
+    # Escaped characters may include commas, so use the full DN parser
+    rdns = split_dn(dn)
+    return rdns[0], ','.join(rdns[1:])
 
 def build_tree(entries: List[Any], base_dn: str) -> Tree:
     """
@@ -186,30 +345,31 @@ def build_tree(entries: List[Any], base_dn: str) -> Tree:
     # Organize entries by DN hierarchy
     tree_nodes = {base_dn: root_tree}
     
-    # Sort entries by DN length (shallowest first)
-    sorted_entries = sorted(entries, key=lambda e: len(parse_dn(e.entry_dn)))
+    # Bucket entries by comma count; a parent DN is a suffix of its child's,
+    # so it always has fewer commas and its bucket is processed first
+    buckets = defaultdict(list)
+    for entry in entries:
+        buckets[entry.entry_dn.count(',')].append(entry)
     
-    for entry in sorted_entries:
-        dn = entry.entry_dn
-        
-        # Skip if this is the base DN
-        if dn == base_dn:
-            continue
+    for depth in sorted(buckets):
+        for entry in buckets[depth]:
+            dn = entry.entry_dn
             
-        # Find parent DN
-        parent_dn = ",".join(dn.split(",")[1:])
-        
-        # If we don't have the parent, use the base or nearest ancestor
-        if parent_dn not in tree_nodes:
-            parent_dn = base_dn
+            # Skip if this is the base DN
+            if dn == base_dn:
+                continue
+                
+            rdn, parent_dn = _split_dn(dn)
             
-        # Add this entry to its parent
-        if parent_dn in tree_nodes:
-            entry_node = tree_nodes[parent_dn].add(f"[yellow]{dn.split(',')[0]}[/yellow]")
+            # If we don't have the parent, use the base or nearest ancestor
+            if parent_dn not in tree_nodes:
+                parent_dn = base_dn
+                
+            # Add this entry to its parent
+            entry_node = tree_nodes[parent_dn].add(f"[yellow]{rdn}[/yellow]")
             
             # Add attributes as children
-            for attr_name in sorted(entry.entry_attributes):
-                values = entry[attr_name].values
+            for attr_name, values in _sorted_attributes(entry):
                 if len(values) == 1:
                     entry_node.add(f"[cyan]{attr_name}:[/cyan] [green]{values[0]}[/green]")
                 else:
@@ -251,7 +411,7 @@ def output_tree(entries: List[Any], base_dn: str, console: Console, output_file:
     else:
         console.print(tree)
 
-def output_rich(entries: List[Any], console: Console, output_file: Optional[str] = None) -> None:
+def output_rich(entries: Iterable[Any], console: Console, output_file: Optional[str] = None) -> None:
     """
     Output LDAP entries in rich text format.
     
@@ -259,7 +419,7 @@ def output_rich(entries: List[Any], console: Console, output_file: Optional[str]
     and panels for better readability.
     
     Args:
-        entries: List of LDAP entry objects
+        entries: Iterable of LDAP entry objects
         console: Rich Console object for output
         output_file: Optional path to save output to a file
     
@@ -271,71 +431,77 @@ def output_rich(entries: List[Any], console: Console, output_file: Optional[str]
         >>> output_rich(entries, console, "output.txt")
     """
     if output_file:
-        # Ensure the file is opened with utf-8 encoding
-        with open(output_file, 'w', encoding='utf-8') as f_out:  # Added encoding and changed variable name
-            out_console = Console(file=f_out, highlight=False)
+        # Ensure the file is opened with utf-8 encoding and stays open while entries stream in
+        with open(output_file, 'w', encoding='utf-8') as f_out:
+            _print_entries(entries, Console(file=f_out, highlight=False))
     else:
-        out_console = console
-        
+        _print_entries(entries, console)
+
+def _print_entries(entries: Iterable[Any], console: Console) -> None:
+    """Print each entry's panel as soon as it is produced."""
     for entry in entries:
-        # Create a panel for each entry
-        table = Table(show_header=True, header_style="bold", box=box.ROUNDED)
-        table.add_column("Attribute", style="cyan")
-        table.add_column("Value", style="green")
-        
-        for attr_name in sorted(entry.entry_attributes):
-            values = entry[attr_name].values
-            if len(values) == 1:
-                table.add_row(attr_name, str(values[0]))
-            else:
-                # For multi-valued attributes, join with newlines
-                table.add_row(attr_name, "\n".join(str(v) for v in values))
+        console.print(render_entry(entry))
+        console.print()  # Empty line between entries
+
+def render_entry(entry: Any) -> Panel:
+    """
+    Build the rich panel used to display a single LDAP entry.
+    
+    Args:
+        entry: LDAP entry object
+    
+    Returns:
+        Rich Panel with an attribute table, titled with the entry DN
         
-        # Create a panel with the DN as title
-        panel = Panel(
-            table,
-            title=f"[yellow]{entry.entry_dn}[/yellow]",
-            title_align="left",
-            border_style="blue"
-        )
-        out_console.print(panel)
-        out_console.print()  # Empty line between entries
-
-def format_output_filename(filename: str, extension: str) -> str:
+    Example:
+        >>> console.print(render_entry(entry))
     """
-    Format output filename based on extension.
+    # Create a panel for each entry
+    table = Table(show_header=True, header_style=_HEADER_STYLE, box=box.ROUNDED)
+    table.add_column("Attribute", style=_ATTRIBUTE_STYLE)
+    table.add_column("Value", style=_VALUE_STYLE)
+    
+    # Cells are plain Text so directory data is never parsed as console markup
+    for attr_name, values in _sorted_attributes(entry):
+        if len(values) == 1:
+            table.add_row(Text(attr_name), Text(str(values[0])))
+        else:
+            # For multi-valued attributes, join with newlines
+            table.add_row(Text(attr_name), Text("\n".join(str(v) for v in values)))
+    
+    # Create a panel with the DN as title
+    return Panel(
+        table,
+        title=Text.assemble((entry.entry_dn, _DN_STYLE)),
+        title_align="left",
+        border_style=_BORDER_STYLE
+    )
+
+def render_entries(entries: List[Any]) -> Group:
+    """
+    Build one renderable for a batch of LDAP entries.
     
-    Ensures the filename has the correct extension.
+    Printing the group with a single console.print call renders and
+    writes the whole batch at once, matching output_rich's layout.
     
-    Args:    
-        filename: Base filename
-        extension: File extension without leading dot
+    Args:
+        entries: List of LDAP entry objects
     
     Returns:
-        Filename with proper extension
+        Rich Group of entry panels separated by blank lines
         
     Example:
-        >>> format_output_filename("results", "json")  # "results.json"
-        >>> format_output_filename("results.txt", "json")  # "results.txt.json"
-        >>> format_output_filename("results.json", "json")  # "results.json"
+        >>> console.print(render_entries(entries))
     """
-    if filename.endswith(f".{extension}"):
-        return filename
-    elif "." in filename:
-        return f"{filename}.{extension}"
-    else:
-        return f"{filename}.{extension}"
-
-"""
-Functions for formatting LDAP entries for output.
-"""
-import json
-import csv
-import io
+    renderables: List[Any] = []
+    for entry in entries:
+        renderables.append(render_entry(entry))
+        renderables.append("")  # Empty line between entries
+    return Group(*renderables)
 
 def format_json(entry_data: dict) -> str:
     """Formats an LDAP entry as a JSON string."""
-    return json.dumps(entry_data, indent=2)
+    return dumps_json(entry_data)
 
 def format_ldif(entry_data: dict) -> str:
     """Formats an LDAP entry as an LDIF string."""
@@ -363,12 +529,18 @@ def format_ldap_entry(entry_data: dict, output_format: str = "json") -> str:
         # Default to a simple string representation or raise an error
         return str(entry_data)
 
-def convert_to_csv(entries: list[dict], fieldnames: list[str] | None = None) -> str:
-    """Converts a list of LDAP entries (dictionaries) to a CSV string."""
+def convert_to_csv(entries: list[dict], fieldnames: list[str] | None = None,
+                   file: TextIO | None = None) -> str | None:
+    """
+    Converts a list of LDAP entries (dictionaries) to CSV.
+
+    Rows are written straight to file when one is given (and None is
+    returned), so callers can stream; otherwise the CSV is returned as a string.
+    """
     if not entries:
-        return ""
+        return None if file is not None else ""
 
-    output = io.StringIO()
+    output = file if file is not None else io.StringIO()
     
     # If fieldnames are not provided, use keys from the first entry
     # Ensuring 'dn' is the first column if present
@@ -380,18 +552,15 @@ def convert_to_csv(entries: list[dict], fieldnames: list[str] | None = None) ->
 
     writer = csv.DictWriter(output, fieldnames=fieldnames, extrasaction='ignore', lineterminator='\n')
     writer.writeheader()
-    for entry in entries:
-        # For attributes that are lists, join them into a single string
-        # This is a simple approach; more complex handling might be needed
-        processed_entry = {}
-        for key, value in entry.items():
-            if isinstance(value, list):
-                processed_entry[key] = ";".join(map(str,value))
-            else:
-                processed_entry[key] = value
-        writer.writerow(processed_entry)
-    
-    return output.getvalue()
+    # For attributes that are lists, join them into a single string
+    # This is a simple approach; more complex handling might be needed
+    writer.writerows(
+        {key: ";".join(map(str, value)) if isinstance(value, list) else value
+         for key, value in entry.items()}
+        for entry in entries
+    )
+    
+    return None if file is not None else output.getvalue()
 
 def format_entries_as_csv(entries: list[dict], fieldnames: list[str] | None = None) -> str:
     """Formats a list of LDAP entries as a CSV string."""
@@ -7,27 +7,37 @@ This module provides a custom help formatter for Click using Rich for beautiful
 """
 
 import os
-import sys
+import re
 import click
-from rich.console import Console
-from rich.theme import Theme
-from rich.table import Table
-from rich.panel import Panel
-from rich.markdown import Markdown
-from functools import wraps
-from typing import Optional, Callable, List, Dict, Any
+from typing import Callable, Dict, Tuple, TYPE_CHECKING
 
-# Create a local console if needed, but prefer importing from ldapie.py
-# to avoid creating multiple consoles
-_local_console = None
+# Rich is imported where it is used, so loading this module (which every
+# command does to attach --help) does not pull in tables and themes
+if TYPE_CHECKING:
+    from rich.console import Console, Group
+
+# The console help is printed to: the one in ldapie.py when it can be imported, else a
+# local one. Resolved on first use, since importing ldapie.py here at load
+# time would be circular
+_console = None
+
+# Everything from the first line starting with "Example:" to the end of the help
+_EXAMPLE_RE = re.compile(r"^[^\S\n]*example:.*", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+# Rendered help per (id(command), console width); see show_rich_help
+_HELP_CACHE: Dict[Tuple[int, int], str] = {}
 
 def get_console():
     """
     Get the console instance, either from the parent module or create a local one.
     
     This helps avoid circular imports while maintaining a single console instance.
+    The instance is looked up once and reused afterwards.
     """
-    global _local_console
+    global _console
+    
+    if _console is not None:
+        return _console
     
     # Try to import the console from ldapie first
     try:
@@ -35,39 +45,40 @@ def get_console():
             from ldapie.ldapie import console
         except ImportError:
             from src.ldapie.ldapie import console
-        return console
     except (ImportError, AttributeError):
         # If that fails, create a local console
-        if _local_console is None:
-            # Define simplified themes
-            dark_theme = {
-                "info": "cyan",
-                "success": "green",
-                "warning": "yellow",
-                "error": "red",
-                "highlight": "magenta",
-                "command": "cyan",
-                "option": "yellow",
-                "usage": "green",
-            }
-            
-            light_theme = {
-                "info": "blue",
-                "success": "green",
-                "warning": "yellow",
-                "error": "red",
-                "highlight": "magenta",
-                "command": "blue",
-                "option": "yellow",
-                "usage": "green",
-            }
-            
-            # Get theme from environment or default to dark
-            theme_name = os.environ.get("LDAPIE_THEME", "dark").lower()
-            theme_colors = light_theme if theme_name == "light" else dark_theme
-            _local_console = Console(theme=Theme(theme_colors))
+        # Define simplified themes
+        dark_theme = {
+            "info": "cyan",
+            "success": "green",
+            "warning": "yellow",
+            "error": "red",
+            "highlight": "magenta",
+            "command": "cyan",
+            "option": "yellow",
+            "usage": "green",
+        }
+        
+        light_theme = {
+            "info": "blue",
+            "success": "green",
+            "warning": "yellow",
+            "error": "red",
+            "highlight": "magenta",
+            "command": "blue",
+            "option": "yellow",
+            "usage": "green",
+        }
         
-        return _local_console
+        # Get theme from environment or default to dark
+        theme_name = os.environ.get("LDAPIE_THEME", "dark").lower()
+        theme_colors = light_theme if theme_name == "light" else dark_theme
+        from rich.console import Console
+        from rich.theme import Theme
+        console = Console(theme=Theme(theme_colors))
+    
+    _console = console
+    return _console
 
 def show_rich_help(ctx: click.Context, param: click.Option, value: bool) -> bool:
     """
@@ -84,32 +95,112 @@ def show_rich_help(ctx: click.Context, param: click.Option, value: bool) -> bool
     if not value or ctx.resilient_parsing:
         return value
     
+    print_rich_help(ctx)
+    ctx.exit()
+
+def print_rich_help(ctx: click.Context) -> None:
+    """
+    Print the rich help for ctx.command.
+    
+    This is the one help renderer: the --help option of every command and
+    the bare `ldapie --help` entry point both come here.
+    
+    Args:
+        ctx: Click context of the command to describe
+    """
     console = get_console()
     
+    # Piped or redirected output carries no styling, so click's plain help is
+    # written instead of laying out Rich tables that would be flattened anyway
+    if not console.is_terminal:
+        click.echo(ctx.get_help(), file=console.file)
+        return
+    
+    # Help text cannot change within a process, so each command's help is
+    # rendered once and the resulting string is written out on later calls
+    key = (id(ctx.command), console.width)
+    rendered = _HELP_CACHE.get(key)
+    if rendered is None:
+        with console.capture() as capture:
+            console.print(_render_help(ctx, console))
+        rendered = _HELP_CACHE[key] = capture.get()
+    console.file.write(rendered)
+    console.file.flush()
+
+def _command_params(command: click.Command) -> Tuple[Tuple[str, ...], Tuple[click.Option, ...]]:
+    """
+    Split a command's parameters into argument names and visible options.
+    
+    Done in one pass over command.params and kept on the command object,
+    since its parameters are fixed once the decorators have run.
+    """
+    cached = command.__dict__.get("_ldapie_params")
+    if cached is None:
+        arguments = []
+        options = []
+        for param in command.params:
+            if isinstance(param, click.Argument):
+                arguments.append(param.name)
+            elif isinstance(param, click.Option) and not param.hidden:
+                options.append(param)
+        cached = command._ldapie_params = (tuple(arguments), tuple(options))
+    return cached
+
+def _group_commands(ctx: click.Context, command: click.Command) -> Tuple[Tuple[str, str], ...]:
+    """
+    A group's (name, short help) pairs sorted by name; empty for a plain command.
+    
+    Sorted and looked up once and kept on the command object, like
+    _command_params.
+    """
+    if not isinstance(command, click.Group):
+        return ()
+    cached = command.__dict__.get("_ldapie_commands")
+    if cached is None:
+        cached = []
+        for cmd_name in sorted(command.list_commands(ctx)):
+            cmd = command.get_command(ctx, cmd_name)
+            cached.append((cmd_name, cmd.get_short_help_str() if cmd else ""))
+        cached = command._ldapie_commands = tuple(cached)
+    return cached
+
+def _render_help(ctx: click.Context, console: "Console") -> "Group":
+    """
+    Build the help for ctx.command as one renderable.
+    
+    Sections are collected and printed with a single console.print, so Rich
+    lays out the whole help in one pass.
+    """
+    from rich.console import Group
+    from rich.rule import Rule
+    from rich.styled import Styled
+    from rich.table import Table
+    
     command = ctx.command
     command_name = command.name
     
     # Title and description
-    console.print(f"\n[bold]{command_name.upper()}[/bold]", style="highlight")
+    renderables = [Styled(f"\n[bold]{command_name.upper()}[/bold]", "highlight")]
     if command.help:
-        console.print(f"\n{command.help}\n")
+        renderables.append(f"\n{command.help}\n")
     
     # Usage
     usage_parts = ["[usage]Usage:[/usage]", command_name]
     
+    arguments, options = _command_params(command)
+    
     # Add command arguments
-    for param in command.params:
-        if isinstance(param, click.Argument):
-            usage_parts.append(f"<{param.name}>")
+    usage_parts.extend(f"<{name}>" for name in arguments)
     
     # Add [options] placeholder
     usage_parts.append("[OPTIONS]")
     
     # Check if this is a group with commands to add COMMAND [ARGS]
-    if isinstance(command, click.Group) and command.list_commands(ctx):
+    commands = _group_commands(ctx, command)
+    if commands:
         usage_parts.append("COMMAND [ARGS]...")
     
-    console.print(" ".join(usage_parts))
+    renderables.append(" ".join(usage_parts))
     
     # Options table
     if command.params:
@@ -117,57 +208,35 @@ def show_rich_help(ctx: click.Context, param: click.Option, value: bool) -> bool
         options_table.add_column("Option", style="option")
         options_table.add_column("Description")
         
-        for param in command.params:
-            if isinstance(param, click.Option):
-                option_names = ", ".join(param.opts)
-                help_text = param.help or ""
-                if param.default and not param.is_flag and param.default != "":
-                    help_text += f" [default: {param.default}]"
-                options_table.add_row(option_names, help_text)
+        for param in options:
+            option_names = ", ".join((*param.opts, *param.secondary_opts))
+            help_text = param.help or ""
+            if param.default and not param.is_flag and param.default != "":
+                help_text += f" [default: {param.default}]"
+            options_table.add_row(option_names, help_text)
         
-        console.print("\n[bold]Options[/bold]")
-        console.rule()
-        console.print(options_table)
+        renderables += ["\n[bold]Options[/bold]", Rule(), options_table]
     
     # Commands section for groups
-    if isinstance(command, click.Group):
-        commands = command.list_commands(ctx)
-        if commands:
-            commands_table = Table(show_header=False, box=None)
-            commands_table.add_column("Command", style="command")
-            commands_table.add_column("Description")
-            
-            for cmd_name in sorted(commands):
-                cmd = command.get_command(ctx, cmd_name)
-                cmd_help = cmd.get_short_help_str() if cmd else ""
-                commands_table.add_row(cmd_name, cmd_help)
-            
-            console.print("\n[bold]Commands[/bold]")
-            console.rule()
-            console.print(commands_table)
-            
-            console.print("\n[info]Run 'ldapie COMMAND --help' for more information on a command.[/info]")
+    if commands:
+        commands_table = Table(show_header=False, box=None)
+        commands_table.add_column("Command", style="command")
+        commands_table.add_column("Description")
+        
+        for cmd_name, cmd_help in commands:
+            commands_table.add_row(cmd_name, cmd_help)
+        
+        renderables += ["\n[bold]Commands[/bold]", Rule(), commands_table,
+                        "\n[info]Run 'ldapie COMMAND --help' for more information on a command.[/info]"]
     
     # Examples
     if command.help:
         # Look for examples in the docstring
-        help_lines = command.help.split("\n")
-        example_lines = []
-        in_example = False
-        
-        for line in help_lines:
-            if line.strip().lower().startswith("example:"):
-                in_example = True
-                example_lines.append(line)
-            elif in_example:
-                example_lines.append(line)
-        
-        if example_lines:
-            console.print("\n[bold]Examples[/bold]")
-            console.rule()
-            console.print("\n".join(example_lines))
+        match = _EXAMPLE_RE.search(command.help)
+        if match:
+            renderables += ["\n[bold]Examples[/bold]", Rule(), match.group(0)]
     
-    ctx.exit()
+    return Group(*renderables)
 
 def add_rich_help_option(f: Callable) -> Callable:
     """
@@ -179,17 +248,12 @@ def add_rich_help_option(f: Callable) -> Callable:
     Returns:
         Decorated function
     """
-    @wraps(f)
-    def decorator(*args, **kwargs):
-        return f(*args, **kwargs)
-    
-    decorator = click.option(
+    # click.option only attaches the parameter to f, so no wrapper frame is needed
+    return click.option(
         '--help',
         is_flag=True,
         expose_value=False,
         is_eager=True,
         help="Show this message and exit.",
         callback=show_rich_help
-    )(decorator)
-    
-    return decorator
+    )(f)
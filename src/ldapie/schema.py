@@ -4,14 +4,27 @@
 Schema and server information functions for LDAPie.
 """
 
-import json
-from typing import Optional, Any
+from collections.abc import Mapping
+from typing import Optional, Any, Dict
 import ldap3 # Keep ldap3 import for KNOWN_CONTROLS and KNOWN_EXTENSIONS if they exist
 from ldap3 import Server, Connection # Removed unused Connection import from here, will be used by functions
-from rich.console import Console
+from ldap3.protocol.rfc4512 import ObjectClassInfo, AttributeTypeInfo
+from rich.console import Console, RenderableType
 from rich.table import Table
 from rich import box
 
+from .cache import LRUTTLCache
+from .output import dumps_json
+
+# Fields format_schema_output shows for ldap3 schema definitions, in display order
+_OBJECT_CLASS_FIELDS = ('name', 'oid', 'description', 'kind', 'superior',
+                        'must_contain', 'may_contain', 'obsolete')
+_ATTRIBUTE_TYPE_FIELDS = ('name', 'oid', 'description', 'superior', 'syntax', 'single_value',
+                          'equality', 'ordering', 'substring', 'usage', 'obsolete')
+
+# Formatted get_schema_info results; a server's schema rarely changes in a session
+schema_cache = LRUTTLCache(maxsize=512, ttl=3600)
+
 # Attempt to import KNOWN_CONTROLS and KNOWN_EXTENSIONS safely
 try:
     from ldap3.protocol.rfc4511 import KNOWN_CONTROLS, KNOWN_EXTENSIONS
@@ -20,6 +33,72 @@ except ImportError:
     KNOWN_EXTENSIONS = {}
 
 
+def load_server_info(server: Server, conn: Connection, kind: str = ldap3.ALL) -> None:
+    """
+    Read the root DSE and/or schema into a server created with get_info=NONE.
+    
+    Servers are built without get_info so connecting does not pay for the
+    schema download; views that need it call this first, asking only for
+    what they show: ldap3.DSA (the root DSE) for server info, ldap3.ALL for
+    schema views, since locating the schema needs the root DSE. Parts the
+    server already holds are not read again, and the server keeps
+    get_info=NONE so later rebinds do not read them either.
+    
+    Args:
+        server: LDAP server object
+        conn: Bound connection to the server
+        kind: ldap3.DSA, ldap3.SCHEMA or ldap3.ALL
+        
+    Example:
+        >>> load_server_info(conn.server, conn, ldap3.DSA)
+        >>> output_server_info_rich(conn.server, console)
+    """
+    need_dsa = kind in (ldap3.DSA, ldap3.ALL) and server.info is None
+    need_schema = kind in (ldap3.SCHEMA, ldap3.ALL) and server.schema is None
+    if not (need_dsa or need_schema):
+        return
+    
+    get_info = server.get_info
+    server.get_info = ldap3.ALL if need_dsa and need_schema else ldap3.DSA if need_dsa else ldap3.SCHEMA
+    try:
+        server.get_info_from_server(conn)
+    finally:
+        server.get_info = get_info
+
+
+def _oid_names(oids: Any, known: Dict[str, str]) -> Dict[str, str]:
+    """
+    Map each supported control or extension OID to a display name.
+    
+    ldap3 decodes these root DSE values into (oid, kind, name, origin)
+    tuples, naming the OIDs it knows; plain OID strings (as from the mock
+    server) are looked up in known. Built in one comprehension per call.
+    """
+    return {
+        oid[0] if isinstance(oid, tuple) else oid:
+        (oid[2] or known.get(oid[0], oid[0])) if isinstance(oid, tuple) else known.get(oid, oid)
+        for oid in oids
+    }
+
+
+def _lines(values: Any) -> str:
+    """One value per line, or "None" when there are none."""
+    return "\n".join(map(str, values)) or "None"
+
+
+# Root DSE properties shown by the info views, in display order:
+# (ServerInfo attribute, table label, JSON key, table formatter, known OID
+# names for OID lists, which are first mapped through _oid_names)
+_INFO_FIELDS = (
+    ("vendor_name", "Vendor", "vendor", str, None),
+    ("vendor_version", "Version", "version", str, None),
+    ("supported_ldap_versions", "LDAP Versions", "ldap_versions", lambda v: ", ".join(map(str, v)), None),
+    ("supported_controls", "Supported Controls", "supported_controls", _lines, KNOWN_CONTROLS),
+    ("supported_extensions", "Supported Extensions", "supported_extensions", _lines, KNOWN_EXTENSIONS),
+    ("naming_contexts", "Naming Contexts", "naming_contexts", _lines, None),
+)
+
+
 def output_server_info_rich(server: Server, console: Console) -> None: # Removed unused conn argument
     """
     Display server information in rich text format.
@@ -36,7 +115,13 @@ def output_server_info_rich(server: Server, console: Console) -> None: # Removed
         None
         
     Example:
+        >>> load_server_info(server, conn, ldap3.DSA)
         >>> output_server_info_rich(server, console)
+    
+    Note:
+        Only the root DSE is shown; build the server with get_info=ldap3.NONE
+        and call load_server_info(server, conn, ldap3.DSA) first rather than
+        reading the schema on connect.
     """
     # For testing purposes, check if we have a mocked _info attribute
     server_info = getattr(server, "_info", server.info)
@@ -50,43 +135,13 @@ def output_server_info_rich(server: Server, console: Console) -> None: # Removed
     table.add_column("Property", style="cyan")
     table.add_column("Value", style="green")
     
-    # Add server properties
-    if hasattr(server_info, "vendor_name"):
-        table.add_row("Vendor", str(server_info.vendor_name))
-    if hasattr(server_info, "vendor_version"):
-        table.add_row("Version", str(server_info.vendor_version))
-    
-    # Add supported LDAP protocol versions
-    if hasattr(server_info, "supported_ldap_versions"):
-        # Convert list to string before adding to table
-        versions_str = ", ".join(str(v) for v in server_info.supported_ldap_versions)
-        table.add_row("LDAP Versions", versions_str)
-    
-    # Add supported controls
-    if hasattr(server_info, "supported_controls"):
-        controls = []
-        for oid in server_info.supported_controls:
-            control_name = KNOWN_CONTROLS.get(oid, oid) # Use safely imported KNOWN_CONTROLS
-            controls.append(f"{control_name}")
-        # Ensure controls is a string, not a list
-        controls_str = "\n".join(controls) if controls else "None"
-        table.add_row("Supported Controls", controls_str)
-    
-    # Add supported extensions
-    if hasattr(server_info, "supported_extensions"):
-        exts = []
-        for oid in server_info.supported_extensions:
-            ext_name = KNOWN_EXTENSIONS.get(oid, oid) # Use safely imported KNOWN_EXTENSIONS
-            exts.append(f"{ext_name}")
-        # Ensure extensions is a string, not a list
-        exts_str = "\n".join(exts) if exts else "None"
-        table.add_row("Supported Extensions", exts_str)
-    
-    # Add naming contexts
-    if hasattr(server_info, "naming_contexts"):
-        # Convert list to string before adding to table
-        contexts_str = "\n".join(str(ctx) for ctx in server_info.naming_contexts) if server_info.naming_contexts else "None"
-        table.add_row("Naming Contexts", contexts_str)
+    # Each property is read once; missing or empty (None) ones are skipped
+    for attr, label, _, fmt, known in _INFO_FIELDS:
+        value = getattr(server_info, attr, None)
+        if value is not None:
+            if known is not None:
+                value = _oid_names(value, known).values()
+            table.add_row(label, fmt(value))
     
     console.print(table)
 
@@ -106,43 +161,29 @@ def output_server_info_json(server: Server, console: Console) -> None: # Removed
         None
         
     Example:
+        >>> load_server_info(server, conn, ldap3.DSA)
         >>> output_server_info_json(server, console)
+    
+    Note:
+        Only the root DSE is shown; build the server with get_info=ldap3.NONE
+        and call load_server_info(server, conn, ldap3.DSA) first rather than
+        reading the schema on connect.
     """
-    if not server.info:
+    # For testing purposes, check if we have a mocked _info attribute
+    server_info = getattr(server, "_info", server.info)
+    if not server_info:
         console.print("[warning]No server info available.[/warning]")
         return
         
     info = {}
     
-    # Add server properties
-    if hasattr(server.info, "vendor_name"):
-        info["vendor"] = server.info.vendor_name
-    if hasattr(server.info, "vendor_version"):
-        info["version"] = server.info.vendor_version
+    # Each property is read once; missing or empty (None) ones are skipped
+    for attr, _, key, _, known in _INFO_FIELDS:
+        value = getattr(server_info, attr, None)
+        if value is not None:
+            info[key] = _oid_names(value, known) if known is not None else value
     
-    # Add supported LDAP protocol versions
-    if hasattr(server.info, "supported_ldap_versions"):
-        info["ldap_versions"] = server.info.supported_ldap_versions
-        
-    # Add supported controls
-    if hasattr(server.info, "supported_controls"):
-        info["supported_controls"] = {}
-        for oid in server.info.supported_controls:
-            control_name = KNOWN_CONTROLS.get(oid, oid) # Use safely imported KNOWN_CONTROLS
-            info["supported_controls"][oid] = control_name
-        
-    # Add supported extensions
-    if hasattr(server.info, "supported_extensions"):
-        info["supported_extensions"] = {}
-        for oid in server.info.supported_extensions:
-            ext_name = KNOWN_EXTENSIONS.get(oid, oid) # Use safely imported KNOWN_EXTENSIONS
-            info["supported_extensions"][oid] = ext_name
-        
-    # Add naming contexts
-    if hasattr(server.info, "naming_contexts"):
-        info["naming_contexts"] = server.info.naming_contexts
-    
-    print(json.dumps(info, indent=2))
+    print(dumps_json(info))
 
 def show_schema(server: Server, object_class: Optional[str], attribute: Optional[str], console: Console) -> None:
     """
@@ -168,29 +209,48 @@ def show_schema(server: Server, object_class: Optional[str], attribute: Optional
     Note:
         Cannot specify both object_class and attribute at the same time.
     """
-    if not server.schema:
-        console.print("[warning]No schema information available.[/warning]")
-        return
+    console.print(render_schema(server, object_class, attribute))
+
+def render_schema(server: Server, object_class: Optional[str], attribute: Optional[str]) -> RenderableType:
+    """
+    Build the renderable shown by show_schema without printing it.
+    
+    The result only depends on the server schema, so callers may keep it
+    and print it again for repeated lookups.
+    
+    Args:
+        server: LDAP server object
+        object_class: Optional specific object class to show
+        attribute: Optional specific attribute to show
+    
+    Returns:
+        A Rich Table, or a markup string for warnings and errors
+        
+    Example:
+        >>> console.print(render_schema(server, "person", None))
+    """
+    schema = server.schema
+    if not schema:
+        return "[warning]No schema information available.[/warning]"
     
     if object_class and attribute:
-        console.print("[error]Cannot specify both object class and attribute.[/error]")
-        return
+        return "[error]Cannot specify both object class and attribute.[/error]"
     
     if object_class:
         # Show info about a specific object class
-        oc_info = server.schema.object_classes.get(object_class.lower())
+        oc_info = schema.object_classes.get(object_class.lower())
         if not oc_info:
-            console.print(f"[error]Object class '{object_class}' not found in schema.[/error]")
-            return
+            return f"[error]Object class '{object_class}' not found in schema.[/error]"
             
         table = Table(title=f"Object Class: {object_class}", box=box.ROUNDED)
         table.add_column("Property", style="ldap.attr")
         table.add_column("Value", style="ldap.value")
         
-        table.add_row("Name", oc_info.name)
+        # ldap3 lists every name of a definition
+        table.add_row("Name", ", ".join(oc_info.name))
         table.add_row("OID", oc_info.oid)
         table.add_row("Description", oc_info.description or "")
-        table.add_row("Type", oc_info.type or "")
+        table.add_row("Type", oc_info.kind or "")
         
         if oc_info.must_contain:
             table.add_row("Required Attributes", "\n".join(sorted(oc_info.must_contain)))
@@ -207,20 +267,19 @@ def show_schema(server: Server, object_class: Optional[str], attribute: Optional
         else:
             table.add_row("Parent Classes", "None")
             
-        console.print(table)
+        return table
         
     elif attribute:
         # Show info about a specific attribute
-        attr_info = server.schema.attribute_types.get(attribute.lower())
+        attr_info = schema.attribute_types.get(attribute.lower())
         if not attr_info:
-            console.print(f"[error]Attribute '{attribute}' not found in schema.[/error]")
-            return
+            return f"[error]Attribute '{attribute}' not found in schema.[/error]"
             
         table = Table(title=f"Attribute: {attribute}", box=box.ROUNDED)
         table.add_column("Property", style="ldap.attr")
         table.add_column("Value", style="ldap.value")
         
-        table.add_row("Name", attr_info.name)
+        table.add_row("Name", ", ".join(attr_info.name))
         table.add_row("OID", attr_info.oid)
         table.add_row("Description", attr_info.description or "")
         table.add_row("Syntax", attr_info.syntax or "")
@@ -233,7 +292,7 @@ def show_schema(server: Server, object_class: Optional[str], attribute: Optional
         if attr_info.substring:
             table.add_row("Substring Match", attr_info.substring)
             
-        console.print(table)
+        return table
         
     else:
         # List all object classes
@@ -241,10 +300,19 @@ def show_schema(server: Server, object_class: Optional[str], attribute: Optional
         table.add_column("Name", style="ldap.attr")
         table.add_column("Description", style="ldap.value")
         
-        for name, oc_info in sorted(server.schema.object_classes.items()):
+        for name, oc_info in sorted(schema.object_classes.items()):
             table.add_row(name, oc_info.description or "")
             
-        console.print(table)
+        return table
+
+def schema_cache_key(conn: Connection, schema_type: str, name: Optional[str] = None) -> tuple:
+    """
+    Build the schema_cache key for a get_schema_info call; names are case-insensitive.
+    
+    Example:
+        >>> text = schema_cache.get(schema_cache_key(conn, "attributes", "cn"))
+    """
+    return (conn.server.name, schema_type.lower(), name.lower() if name else None)
 
 def get_schema_info(conn: Connection, schema_type: str, name: Optional[str] = None) -> str: # conn is used here
     """
@@ -252,6 +320,10 @@ def get_schema_info(conn: Connection, schema_type: str, name: Optional[str] = No
     
     Retrieves and formats schema information for object classes or attributes.
     
+    Successful lookups are kept in schema_cache, so asking again for the same
+    definition on the same server returns it without formatting it again.
+    Missing schemas and unknown names are not cached and are looked up anew.
+    
     Args:
         conn: LDAP connection object
         schema_type: Type of schema information to retrieve ("objectclasses" or "attributes")
@@ -268,28 +340,41 @@ def get_schema_info(conn: Connection, schema_type: str, name: Optional[str] = No
     Raises:
         ValueError: If schema_type is invalid
     """
-    if not conn.server.schema:
+    cache_key = schema_cache_key(conn, schema_type, name)
+    info = schema_cache.get(cache_key)
+    if info is not None:
+        return info
+    
+    load_server_info(conn.server, conn)
+    schema = conn.server.schema
+    if not schema:
         return "No schema information available"
-            
-    if schema_type.lower() == "objectclasses" or schema_type.lower() == "objectclass":
+    
+    schema_type = schema_type.lower()
+    if schema_type in ("objectclasses", "objectclass"):
+        object_classes = schema.object_classes
         if name:
-            schema_obj = conn.server.schema.object_classes.get(name.lower())
+            schema_obj = object_classes.get(name.lower())
             if not schema_obj:
                 return f"Object class '{name}' not found in schema"
-            return format_schema_output(schema_obj)
         else:
-            return format_schema_output(conn.server.schema.object_classes)
+            schema_obj = object_classes
     
-    elif schema_type.lower() == "attributes" or schema_type.lower() == "attribute":
+    elif schema_type in ("attributes", "attribute"):
+        attribute_types = schema.attribute_types
         if name:
-            schema_attr = conn.server.schema.attribute_types.get(name.lower())
-            if not schema_attr:
+            schema_obj = attribute_types.get(name.lower())
+            if not schema_obj:
                 return f"Attribute '{name}' not found in schema"
-            return format_schema_output(schema_attr)
         else:
-            return format_schema_output(conn.server.schema.attribute_types)
+            schema_obj = attribute_types
     
-    raise ValueError("Invalid schema type. Use 'objectclasses' or 'attributes'")
+    else:
+        raise ValueError("Invalid schema type. Use 'objectclasses' or 'attributes'")
+    
+    info = format_schema_output(schema_obj)
+    schema_cache.put(cache_key, info)
+    return info
 
 def format_schema_output(schema_obj: Any) -> str:
     """
@@ -306,18 +391,24 @@ def format_schema_output(schema_obj: Any) -> str:
     Example:
         >>> output = format_schema_output(server.schema.object_classes["person"])
     """
-    if isinstance(schema_obj, dict):
+    if isinstance(schema_obj, Mapping):  # ldap3's schema dicts are not dict subclasses
         # Format a collection of schema objects
         output = []
         for name, obj in schema_obj.items():
             output.append(f"{name}: {obj.description or 'No description'}")
         return "\n".join(output)
     else:
-        # Format a single schema object
+        # Format a single schema object from the fields its type defines
+        if isinstance(schema_obj, ObjectClassInfo):
+            fields = _OBJECT_CLASS_FIELDS
+        elif isinstance(schema_obj, AttributeTypeInfo):
+            fields = _ATTRIBUTE_TYPE_FIELDS
+        else:
+            fields = [attr for attr in dir(schema_obj)
+                      if not attr.startswith('_') and not callable(getattr(schema_obj, attr))]
         result = []
-        for attr in dir(schema_obj):
-            if not attr.startswith('_') and not callable(getattr(schema_obj, attr)):
-                value = getattr(schema_obj, attr)
-                if value is not None:
-                    result.append(f"{attr}: {value}")
+        for attr in fields:
+            value = getattr(schema_obj, attr, None)
+            if value is not None:
+                result.append(f"{attr}: {value}")
         return "\n".join(result)
@@ -4,12 +4,129 @@
 LDAP search and query related functions for LDAPie.
 """
 
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Iterator, Tuple, Dict
 from ldap3 import Connection, ALL_ATTRIBUTES, BASE
 from rich.console import Console
 from rich.table import Table
 from rich import box
 
+from .cache import LRUTTLCache, cached
+
+# Paged results control OID; its response value carries the next-page cookie
+PAGED_RESULTS_OID = '1.2.840.113556.1.4.319'
+
+# Recent search results; writes through entry_operations flush affected DNs
+search_cache = LRUTTLCache(maxsize=128, ttl=300)
+
+# Results larger than this are streamed but not kept in search_cache
+SEARCH_CACHE_MAX_ENTRIES = 1000
+
+def search_cache_key(
+    conn: Connection,
+    base_dn: str,
+    filter_query: str,
+    search_scope,
+    attributes,
+    page_size: int = 0,
+    limit: Optional[int] = None
+) -> Tuple:
+    """
+    Build the search_cache key for a search; the page size does not change the result.
+    
+    Example:
+        >>> entries = search_cache.get(search_cache_key(conn, base, "(uid=jdoe)", SUBTREE, ["cn"]))
+    """
+    _ = page_size
+    attrs = attributes if isinstance(attributes, str) else tuple(sorted(attributes))
+    return (base_dn, filter_query, str(search_scope), attrs, conn.server.name, conn.user, limit)
+
+def _fetch_page(
+    conn: Connection,
+    base_dn: str,
+    filter_query: str,
+    search_scope,
+    attributes,
+    page_size: int,
+    cookie: Optional[bytes]
+) -> Tuple[List[Any], Optional[bytes]]:
+    """
+    Fetch one page of a paged search.
+    
+    Returns:
+        The page's entries and the cookie for the next page (None when done)
+    """
+    conn.search(
+        base_dn,
+        filter_query,
+        search_scope=search_scope,
+        attributes=attributes,
+        paged_size=page_size,
+        paged_cookie=cookie
+    )
+    entries = list(conn.entries)
+    controls = conn.result.get('controls')
+    if not controls or PAGED_RESULTS_OID not in controls:
+        return entries, None
+    return entries, controls[PAGED_RESULTS_OID]['value']['cookie'] or None
+
+def iter_paged_search(
+    conn: Connection,
+    base_dn: str,
+    filter_query: str,
+    search_scope,
+    attributes,
+    page_size: int,
+    limit: Optional[int] = None
+) -> Iterator[Any]:
+    """
+    Perform a paged search and yield entries as each page arrives.
+    
+    Only one page is held in memory. The next page is requested when the
+    caller has consumed the current one, on the caller's thread, so other
+    operations on conn between entries never race with a page request.
+    The search ends on the server's empty cookie, and with a limit the last
+    page only asks for the entries still missing.
+    
+    Args:
+        conn: LDAP connection object
+        base_dn: Search base DN
+        filter_query: LDAP search filter
+        search_scope: Search scope (BASE, LEVEL, SUBTREE)
+        attributes: List of attributes to retrieve or ALL_ATTRIBUTES
+        page_size: Number of entries per page
+        limit: Maximum number of entries to return (None for no limit)
+    
+    Yields:
+        LDAP entry objects
+        
+    Example:
+        >>> for entry in iter_paged_search(conn, "dc=example,dc=com", "(objectClass=person)",
+        ...                                SUBTREE, ["cn", "mail"], 100):
+        ...     print(entry.entry_dn)
+    """
+    query = (conn, base_dn, filter_query, search_scope, attributes)
+    entry_count = 0
+    cookie = None
+    
+    while True:
+        # With a limit, no page asks for more entries than are still wanted
+        # (RFC 2696 lets the size change between pages)
+        size = min(page_size, limit - entry_count) if limit else page_size
+        entries, cookie = _fetch_page(*query, size, cookie)
+        
+        for entry in entries:
+            yield entry
+            entry_count += 1
+            
+            # Check if we've reached the limit
+            if limit and entry_count >= limit:
+                return
+        
+        # If no more pages, exit loop
+        if not cookie:
+            return
+
+@cached(search_cache, key=search_cache_key)
 def paged_search(
     conn: Connection,
     base_dn: str,
@@ -24,6 +141,8 @@ def paged_search(
     
     Uses the LDAP paged results control to retrieve large result sets in
     chunks, which is more efficient than fetching all results at once.
+    Results are kept in search_cache, so repeating a search within its TTL
+    does not query the server again.
     
     Args:
         conn: LDAP connection object
@@ -41,36 +160,26 @@ def paged_search(
         >>> entries = paged_search(conn, "dc=example,dc=com", "(objectClass=person)", 
         ...                        SUBTREE, ["cn", "mail"], 100, 500)
     """
-    entries = []
-    entry_count = 0
-    cookie = None
+    return list(iter_paged_search(
+        conn, base_dn, filter_query, search_scope, attributes, page_size, limit
+    ))
+
+def _read_entries(
+    conn: Connection,
+    dns: Tuple[str, ...],
+    attributes
+) -> List[Optional[Dict[str, List[Any]]]]:
+    """
+    Read each DN's attributes with a BASE search.
     
-    while True:
-        conn.search(
-            base_dn,
-            filter_query,
-            search_scope=search_scope,
-            attributes=attributes,
-            paged_size=page_size,
-            paged_cookie=cookie
-        )
-        
-        entries.extend(conn.entries)
-        entry_count += len(conn.entries)
-        
-        # Check if we've reached the limit
-        if limit and entry_count >= limit:
-            entries = entries[:limit]
-            break
-            
-        # Get cookie for next page
-        cookie = conn.result.get('controls', {}).get('1.2.840.113556.1.4.319', {}).get('value', {}).get('cookie')
-        
-        # If no more pages, exit loop
-        if not cookie:
-            break
-            
-    return entries
+    Returns:
+        {attribute: [values]} per DN, in order, or None where the entry is missing
+    """
+    found = []
+    for dn in dns:
+        conn.search(dn, "(objectClass=*)", search_scope=BASE, attributes=attributes)
+        found.append(conn.entries[0].entry_attributes_as_dict if conn.entries else None)
+    return found
 
 def compare_entries(
     conn: Connection, 
@@ -102,23 +211,14 @@ def compare_entries(
     """
     # Get the entries
     attributes = list(attrs) if attrs else ALL_ATTRIBUTES
-    
-    # Search for first entry
-    conn.search(dn1, "(objectClass=*)", search_scope=BASE, attributes=attributes)
-    if not conn.entries:
-        console.print(f"[red]Entry not found: {dn1}[/red]")
-        return
-    entry1 = conn.entries[0]
-    
-    # Search for second entry
-    conn.search(dn2, "(objectClass=*)", search_scope=BASE, attributes=attributes)
-    if not conn.entries:
-        console.print(f"[red]Entry not found: {dn2}[/red]")
-        return
-    entry2 = conn.entries[0]
+    entry1, entry2 = _read_entries(conn, (dn1, dn2), attributes)
+    for dn, entry in ((dn1, entry1), (dn2, entry2)):
+        if entry is None:
+            console.print(f"[red]Entry not found: {dn}[/red]")
+            return
     
     # Get all attributes to compare
-    attr_set = set(entry1.entry_attributes).union(set(entry2.entry_attributes))
+    attr_set = entry1.keys() | entry2.keys()
     if attrs:
         attr_set = attr_set.intersection(set(attrs))
     
@@ -134,48 +234,41 @@ def compare_entries(
     diff_count = 0
     missing_count = 0
     
+    # Stringify each side's values once; equal values are equal sets
+    values1 = {attr: frozenset(map(str, values)) for attr, values in entry1.items() if attr in attr_set}
+    values2 = {attr: frozenset(map(str, values)) for attr, values in entry2.items() if attr in attr_set}
+    both = values1.keys() & values2.keys()
+    
     for attr in sorted(attr_set):
-        has_attr1 = attr in entry1.entry_attributes
-        has_attr2 = attr in entry2.entry_attributes
-        
-        if has_attr1 and has_attr2:
+        if attr in both:
             # Both entries have this attribute
-            values1 = sorted(str(v) for v in entry1[attr].values)
-            values2 = sorted(str(v) for v in entry2[attr].values)
-            
-            if values1 == values2:
-                # Values are equal
-                table.add_row(
-                    attr,
-                    "\n".join(values1),
-                    "\n".join(values2),
-                    "✓ Equal"
-                )
+            if values1[attr] == values2[attr]:
+                status = "✓ Equal"
                 equal_count += 1
             else:
-                # Values differ
-                table.add_row(
-                    attr,
-                    "\n".join(values1),
-                    "\n".join(values2),
-                    "≠ Different"
-                )
+                status = "≠ Different"
                 diff_count += 1
-        elif has_attr1:
+            table.add_row(
+                attr,
+                "\n".join(sorted(values1[attr])),
+                "\n".join(sorted(values2[attr])),
+                status
+            )
+        elif attr in values1:
             # Only first entry has this attribute
             table.add_row(
                 attr,
-                "\n".join(str(v) for v in entry1[attr].values),
+                "\n".join(sorted(values1[attr])),
                 "",
                 "! Missing in DN 2"
             )
             missing_count += 1
-        elif has_attr2:
+        else:
             # Only second entry has this attribute
             table.add_row(
                 attr,
                 "",
-                "\n".join(str(v) for v in entry2[attr].values),
+                "\n".join(sorted(values2[attr])),
                 "! Missing in DN 1"
             )
             missing_count += 1
@@ -184,7 +277,7 @@ def compare_entries(
     console.print(table)
     
     # Print summary
-    console.print("\\n[yellow]Comparison Summary:[/yellow]")
+    console.print("\n[yellow]Comparison Summary:[/yellow]")
     console.print(f"  Equal attributes: {equal_count}")
     console.print(f"  Different attributes: {diff_count}")
     console.print(f"  Missing attributes: {missing_count}")
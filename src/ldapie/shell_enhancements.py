@@ -7,7 +7,37 @@ This module integrates the tab completion and query history features
 into the LDAPShell class.
 """
 
+from functools import wraps
+from types import MethodType
+
 from .tab_completion import TabCompletion, QueryHistory
+from .utils import split_args
+
+_QUOTES = ("'", '"')
+
+def _first_arg(arg):
+    """
+    Return the first argument of a command line without its quotes.
+    
+    Only the first token is needed, so the line is split once on whitespace
+    and shlex is left to the rare case of a token containing quotes that
+    are not a simple pair around the whole token.
+    """
+    parts = arg.split(None, 1)
+    if not parts:
+        return None
+    token = parts[0]
+    quote = token[0]
+    if quote in _QUOTES:
+        rest = arg.lstrip()
+        end = rest.find(quote, 1)
+        closed = end > 0 and (end + 1 == len(rest) or rest[end + 1].isspace())
+        if closed and not any(q in rest[1:end] for q in _QUOTES):
+            return rest[1:end]
+    elif '"' not in token and "'" not in token:
+        return token
+    args = split_args(arg)
+    return args[0] if args else None
 
 def integrate_tab_completion(shell_instance):
     """
@@ -45,64 +75,26 @@ def add_history_command(shell_instance):
         View command history or specific query types
         Usage: history [search|base|host]
         """
-        from rich.table import Table
+        # Same tables as LDAPShell's session history, filled from QueryHistory
+        from .interactive import HISTORY_TABLES, build_history_table
         
         # Parse arguments
         if not arg:
-            # Show all history
-            table = Table(title="Command History", show_header=True)
-            table.add_column("Type", style="cyan")
-            table.add_column("Value", style="green")
-            
-            # Show search filters
-            for filter_query in self.query_history.get_searches():
-                table.add_row("search", filter_query)
-            
-            # Show base DNs
-            for base_dn in self.query_history.get_bases():
-                table.add_row("base", base_dn)
-                
-            # Show hosts
-            for host in self.query_history.get_hosts():
-                table.add_row("host", host)
-                
-            self.console.print(table)
-        elif arg == "search":
-            # Show search filters
-            table = Table(title="Search History", show_header=True)
-            table.add_column("#", style="dim")
-            table.add_column("Filter", style="green")
-            
-            for i, filter_query in enumerate(self.query_history.get_searches(), 1):
-                table.add_row(str(i), filter_query)
-                
-            self.console.print(table)
-        elif arg == "base":
-            # Show base DNs
-            table = Table(title="Base DN History", show_header=True)
-            table.add_column("#", style="dim")
-            table.add_column("DN", style="green")
-            
-            for i, base_dn in enumerate(self.query_history.get_bases(), 1):
-                table.add_row(str(i), base_dn)
-                
-            self.console.print(table)
-        elif arg == "host":
-            # Show hosts
-            table = Table(title="Host History", show_header=True)
-            table.add_column("#", style="dim")
-            table.add_column("Host", style="green")
-            
-            for i, host in enumerate(self.query_history.get_hosts(), 1):
-                table.add_row(str(i), host)
-                
-            self.console.print(table)
+            # Show all history: search filters, base DNs and hosts, in that order
+            rows = [(kind, value)
+                    for kind, values in self.query_history.get_history().items()
+                    for value in values]
+            self.console.print(build_history_table(None, rows))
+        elif arg in HISTORY_TABLES:
+            values = self.query_history.get_history(arg)
+            rows = [(str(i), value) for i, value in enumerate(values, 1)]
+            self.console.print(build_history_table(arg, rows))
         else:
             self.console.print(f"[error]Unknown history type: {arg}[/error]")
             self.console.print("[info]Available types: search, base, host[/info]")
     
     # Add the method to the shell instance
-    shell_instance.do_history = do_history.__get__(shell_instance)
+    shell_instance.do_history = MethodType(do_history, shell_instance)
     
     return shell_instance
 
@@ -110,30 +102,20 @@ def enhance_do_search(shell_instance):
     """Enhance search command to track history"""
     original_do_search = shell_instance.do_search
     
+    @wraps(original_do_search)
     def enhanced_do_search(self, arg):
         """Enhanced search with history tracking"""
-        import shlex
-        
-        # Extract the filter from the arg
-        try:
-            args = shlex.split(arg)
-            if args:
-                filter_query = args[0]
-                
-                # Remove surrounding quotes if present
-                if filter_query.startswith(("'", '"')) and filter_query.endswith(("'", '"')):
-                    filter_query = filter_query[1:-1]
-                    
-                # Add to history
-                self.query_history.add_search(filter_query)
-        except:
-            pass  # Ignore parsing errors
+        # Extract the filter from the arg; _first_arg already drops its quotes
+        filter_query = _first_arg(arg)
+        if filter_query:
+            # Add to history
+            self.query_history.add_search(filter_query)
         
         # Call original method
         return original_do_search(arg)
     
     # Replace the method
-    shell_instance.do_search = enhanced_do_search.__get__(shell_instance)
+    shell_instance.do_search = MethodType(enhanced_do_search, shell_instance)
     
     return shell_instance
 
@@ -141,6 +123,7 @@ def enhance_do_base(shell_instance):
     """Enhance base command to track history"""
     original_do_base = shell_instance.do_base
     
+    @wraps(original_do_base)
     def enhanced_do_base(self, arg):
         """Enhanced base command with history tracking"""
         if arg:
@@ -151,7 +134,7 @@ def enhance_do_base(shell_instance):
         return original_do_base(arg)
     
     # Replace the method
-    shell_instance.do_base = enhanced_do_base.__get__(shell_instance)
+    shell_instance.do_base = MethodType(enhanced_do_base, shell_instance)
     
     return shell_instance
 
@@ -159,6 +142,7 @@ def enhance_do_connect(shell_instance):
     """Enhance connect command to track history"""
     original_do_connect = shell_instance.do_connect
     
+    @wraps(original_do_connect)
     def enhanced_do_connect(self, arg):
         """Enhanced connect command with history tracking"""
         args = arg.split()
@@ -171,7 +155,7 @@ def enhance_do_connect(shell_instance):
         return original_do_connect(arg)
     
     # Replace the method
-    shell_instance.do_connect = enhanced_do_connect.__get__(shell_instance)
+    shell_instance.do_connect = MethodType(enhanced_do_connect, shell_instance)
     
     return shell_instance
 
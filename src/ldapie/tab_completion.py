@@ -11,6 +11,48 @@ import os
 import readline
 import json
 
+try:
+    from prompt_toolkit.completion import Completer, Completion
+except ImportError:
+    # prompt_toolkit is optional; readline completion works without it
+    Completer = object  # type: ignore
+    Completion = None  # type: ignore
+
+# Query history location, expanded once at import
+QUERY_HISTORY_FILE = os.path.expanduser('~/.ldapie_query_history.json')
+
+# Interactive shell commands offered for completion
+_COMMANDS = (
+    'connect', 'base', 'search', 'info', 'schema',
+    'exit', 'quit', 'help', 'history', 'validate', 'suggest'
+)
+
+def _build_prefix_map(words):
+    """Map every prefix of every word (including '') to the words it matches"""
+    prefix_map = {}
+    for word in words:
+        for i in range(len(word) + 1):
+            prefix_map.setdefault(word[:i], []).append(word)
+    return {prefix: tuple(matches) for prefix, matches in prefix_map.items()}
+
+# Command completions for every possible prefix, so lookup is a single dict access
+_COMMAND_PREFIXES = _build_prefix_map(_COMMANDS)
+
+# Suggestions used when the query history is still empty
+_DEFAULT_HOSTS = ('localhost', 'ldap.example.com', '127.0.0.1')
+_DEFAULT_DNS = ('dc=example,dc=com', 'ou=people,dc=example,dc=com', 'ou=groups,dc=example,dc=com')
+_DEFAULT_FILTERS = (
+    '(objectClass=*)',
+    '(cn=*)',
+    '(uid=*)',
+    '(&(objectClass=person)(cn=*))',
+    '(|(uid=*)(mail=*))'
+)
+
+_SEARCH_START = ("(objectClass=*)", "(cn=*)", "(uid=*)", "--help")
+_SEARCH_OPTIONS = ('-a', '--tree', '--json', '--ldif', '--csv')
+_HISTORY_TYPES = ('search', 'base', 'host')
+
 class QueryHistory:
     """
     Manages command and query history for the interactive shell
@@ -21,12 +63,14 @@ class QueryHistory:
     
     def __init__(self):
         """Initialize query history"""
+        # Each bucket is an insertion-ordered dict used as an ordered set,
+        # so moving a value to the end is O(1)
         self.history = {
-            'search': [],  # search filters
-            'base': [],    # base DNs
-            'host': []     # hostnames
+            'search': {},  # search filters
+            'base': {},    # base DNs
+            'host': {}     # hostnames
         }
-        self.history_file = os.path.expanduser('~/.ldapie_query_history.json')
+        self.history_file = QUERY_HISTORY_FILE
         self.load_history()
         
     def add_search(self, filter_query):
@@ -47,51 +91,51 @@ class QueryHistory:
             return
             
         # Remove if already exists (to move to end)
-        if value in self.history[history_type]:
-            self.history[history_type].remove(value)
-            
-        # Add to end of list
-        self.history[history_type].append(value)
+        bucket = self.history[history_type]
+        bucket.pop(value, None)
+        bucket[value] = None
         
-        # Keep history to a reasonable size
-        if len(self.history[history_type]) > 20:
-            self.history[history_type] = self.history[history_type][-20:]
+        # Keep history to a reasonable size by dropping the oldest entry
+        if len(bucket) > 20:
+            del bucket[next(iter(bucket))]
             
         # Save to disk
         self.save_history()
         
     def get_searches(self):
         """Get search filter history"""
-        return self.history['search']
+        return list(self.history['search'])
         
     def get_bases(self):
         """Get base DN history"""
-        return self.history['base']
+        return list(self.history['base'])
         
     def get_hosts(self):
         """Get host history"""
-        return self.history['host']
+        return list(self.history['host'])
         
     def get_history(self, history_type=None):
         """Get full history or specific type"""
         if history_type:
-            return self.history.get(history_type, [])
-        return self.history
+            return list(self.history.get(history_type, {}))
+        return {k: list(v) for k, v in self.history.items()}
         
     def save_history(self):
         """Save history to file"""
         try:
             with open(self.history_file, 'w') as f:
-                json.dump(self.history, f)
+                json.dump(self.get_history(), f)
         except (IOError, PermissionError) as e:
             print(f"Warning: Could not save query history: {e}")
             
     def load_history(self):
         """Load history from file"""
         try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    self.history.update(json.load(f))
+            with open(self.history_file, 'r') as f:
+                for history_type, values in json.load(f).items():
+                    self.history[history_type] = dict.fromkeys(values)
+        except FileNotFoundError:
+            pass
         except (IOError, json.JSONDecodeError, PermissionError) as e:
             print(f"Warning: Could not load query history: {e}")
 
@@ -102,13 +146,21 @@ class TabCompletion:
     def __init__(self, query_history=None):
         """Initialize with optional query history"""
         self.query_history = query_history or QueryHistory()
+        # Argument completers by command name, resolved once instead of per Tab
+        self._handlers = {
+            'search': self.complete_search,
+            'connect': self.complete_connect,
+            'base': self.complete_base,
+            'history': self.complete_history,
+            'schema': self.complete_schema,
+        }
     
-    def complete_search(self, text, line, begidx, endidx):
+    def complete_search(self, text, line, begidx, endidx, _args=None):
         """Tab completion for search command"""
-        args = line.split()
+        args = _args if _args is not None else line.split()
         if len(args) == 1 and not text:
             # Just entered "search"
-            return ["(objectClass=*)", "(cn=*)", "(uid=*)", "--help"]
+            return list(_SEARCH_START)
         elif len(args) == 2 or (len(args) == 1 and text):
             # Second argument - filter
             return self.get_search_filters_completion(text)
@@ -116,13 +168,12 @@ class TabCompletion:
             # Attributes or options
             if text.startswith('-'):
                 # Options
-                options = ['-a', '--tree', '--json', '--ldif', '--csv']
-                return [opt for opt in options if opt.startswith(text)]
+                return [opt for opt in _SEARCH_OPTIONS if opt.startswith(text)]
             return []
 
-    def complete_connect(self, text, line, begidx, endidx):
+    def complete_connect(self, text, line, begidx, endidx, _args=None):
         """Tab completion for connect command"""
-        args = line.split()
+        args = _args if _args is not None else line.split()
         if len(args) == 1 and not text:
             # Just entered "connect"
             return ["ldap://", "ldaps://"] + self.get_hosts_completion("")
@@ -141,52 +192,52 @@ class TabCompletion:
                 return [opt for opt in options if opt.startswith(text)]
         return []
 
-    def complete_base(self, text, line, begidx, endidx):
+    def complete_base(self, text, line, begidx, endidx, _args=None):
         """Tab completion for base command"""
-        args = line.split()
+        args = _args if _args is not None else line.split()
         if len(args) <= 2 or (len(args) == 1 and text):
             # Base DN
             return self.get_base_dns_completion(text)
         return []
             
-    def complete_history(self, text, line, begidx, endidx):
+    def complete_history(self, text, line, begidx, endidx, _args=None):
         """Tab completion for history command"""
-        history_types = ['search', 'base', 'host']
-        if len(line.split()) == 1:
-            return [h for h in history_types if h.startswith(text)]
+        args = _args if _args is not None else line.split()
+        if len(args) == 1:
+            return [h for h in _HISTORY_TYPES if h.startswith(text)]
         return []
         
-    def complete_schema(self, text, line, begidx, endidx):
+    def complete_schema(self, text, line, begidx, endidx, _args=None):
         """Tab completion for schema command"""
-        args = line.split()
+        args = _args if _args is not None else line.split()
         if len(args) == 2 and text.startswith('--'):
             return ['--attr'] if '--attr'.startswith(text) else []
         return []
         
+    def get_matches(self, text, line, begidx, endidx, _args=None):
+        """Build the list of completions for ``text`` within ``line``"""
+        if not line:
+            return self.get_commands('')
+            
+        parts = _args if _args is not None else line.split()
+        command = parts[0] if parts else None
+        
+        # If we're completing a command name
+        if len(parts) == 1 and not line.endswith(' '):
+            return self.get_commands(text)
+            
+        # Forward to command-specific completion method
+        handler = self._handlers.get(command)
+        return handler(text, line, begidx, endidx, _args=parts) if handler else []
+        
     def complete(self, text, state):
         """Main completion method for readline"""
         if state == 0:
-            # This is the first time for this text, so build a match list
+            # This is the first time for this text: tokenize the readline
+            # buffer once and hand the tokens to the argument completer
             line = readline.get_line_buffer()
-            if not line:
-                self.matches = self.get_commands('')
-            else:
-                parts = line.split()
-                command = parts[0] if parts else None
-                
-                # If we're completing a command name
-                if len(parts) == 1 and not line.endswith(' '):
-                    self.matches = self.get_commands(text)
-                # If we're completing command arguments
-                else:
-                    # Forward to command-specific completion method
-                    method_name = f"complete_{command}" if command else None
-                    if method_name and hasattr(self, method_name):
-                        self.matches = getattr(self, method_name)(
-                            text, line, readline.get_begidx(), readline.get_endidx()
-                        )
-                    else:
-                        self.matches = []
+            self.matches = self.get_matches(text, line, readline.get_begidx(),
+                                            readline.get_endidx(), _args=line.split())
         
         # Return the state'th match
         try:
@@ -196,44 +247,36 @@ class TabCompletion:
             
     def get_commands(self, prefix):
         """Get all command names starting with prefix"""
-        commands = [
-            'connect', 'base', 'search', 'info', 'schema', 
-            'exit', 'quit', 'help', 'history', 'validate', 'suggest'
-        ]
-        return [cmd for cmd in commands if cmd.startswith(prefix)]
+        return list(_COMMAND_PREFIXES.get(prefix, ()))
             
     def get_hosts_completion(self, text):
         """Get host completions"""
-        hosts = set(self.query_history.get_hosts())
-        
-        # Add common defaults
-        if not hosts:
-            hosts.update(['localhost', 'ldap.example.com', '127.0.0.1'])
-        
+        # History entries are already unique; fall back to common defaults
+        hosts = self.query_history.get_hosts() or _DEFAULT_HOSTS
         return [host for host in hosts if host.startswith(text)]
         
     def get_base_dns_completion(self, text):
         """Get base DN completions"""
-        dns = set(self.query_history.get_bases())
-        
-        # Add common defaults
-        if not dns:
-            dns.update(['dc=example,dc=com', 'ou=people,dc=example,dc=com', 'ou=groups,dc=example,dc=com'])
-        
+        dns = self.query_history.get_bases() or _DEFAULT_DNS
         return [dn for dn in dns if dn.startswith(text)]
         
     def get_search_filters_completion(self, text):
         """Get search filter completions"""
-        filters = set(self.query_history.get_searches())
-        
-        # Add common defaults
-        if not filters:
-            filters.update([
-                '(objectClass=*)', 
-                '(cn=*)', 
-                '(uid=*)',
-                '(&(objectClass=person)(cn=*))',
-                '(|(uid=*)(mail=*))'
-            ])
-            
+        filters = self.query_history.get_searches() or _DEFAULT_FILTERS
         return [f for f in filters if f.startswith(text)]
+
+class LDAPCompleter(Completer):  # type: ignore
+    """prompt_toolkit adapter around TabCompletion"""
+    
+    def __init__(self, tab_completion):
+        """Wrap an existing TabCompletion instance"""
+        self.tab_completion = tab_completion
+        
+    def get_completions(self, document, complete_event):
+        """Yield prompt_toolkit completions for the text before the cursor"""
+        line = document.text_before_cursor
+        text = document.get_word_before_cursor(WORD=True)
+        begidx = len(line) - len(text)
+        
+        for match in self.tab_completion.get_matches(text, line, begidx, len(line)):
+            yield Completion(match, start_position=-len(text))
@@ -6,48 +6,67 @@ General utility functions for LDAPie.
 
 # General purpose utilities for LDAPie
 
+import shlex
+from functools import lru_cache
+from urllib.parse import urlparse
 import ldap3 # For parse_modification_attributes
 from ldap3 import Connection # Explicitly import Connection for type hinting
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, NamedTuple
 
-# Re-export commonly used functions from other modules to maintain compatibility
-# with code that imports from ldapie_utils
-try:
-    # Import the functions but don't actually use them here - just re-export
-    from .output import output_json, output_ldif, output_csv, build_tree, output_tree, output_rich
-    from .schema import output_server_info_rich, output_server_info_json, show_schema, get_schema_info
-    from .entry_operations import delete_entry, add_entry, modify_entry
-    from .search import compare_entries, compare_entry
-    
-    __all__ = [
-        'output_json', 'output_ldif', 'output_csv', 'build_tree', 'output_tree', 'output_rich',
-        'output_server_info_rich', 'output_server_info_json', 'show_schema', 'get_schema_info',
-        'delete_entry', 'add_entry', 'modify_entry', 'compare_entries', 'compare_entry',
-        # Utilities defined in this file
-        'parse_ldap_uri', 'validate_search_filter', 'parse_attributes', 'create_connection',
-        'safe_get_password', 'handle_error_response', 'parse_modification_attributes', 'format_output_filename'
-    ]
-except ImportError:
-    # This will be handled by the main script's import error handling
-    pass
+__all__ = [
+    'LdapURI', 'parse_ldap_uri', 'validate_search_filter', 'parse_attributes', 'create_connection',
+    'safe_get_password', 'handle_error_response', 'parse_modification_attributes', 'format_output_filename',
+    'split_args'
+]
 
-def parse_ldap_uri(uri: str):
-    """Parses an LDAP URI."""
-    # Placeholder implementation
-    raise NotImplementedError("parse_ldap_uri is not yet implemented")
+
+def __getattr__(name: str):
+    # Output, schema, entry and search helpers used to be re-exported here as
+    # well; they are now served, with a deprecation warning, by the single
+    # compatibility layer in ldapie_utils.
+    from . import ldapie_utils
+    if ldapie_utils._reexports.get(name, "utils") == "utils":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return ldapie_utils._load(__name__, name)
+
+class LdapURI(NamedTuple):
+    """Components of an LDAP URI, as returned by parse_ldap_uri."""
+    scheme: str
+    hostname: Optional[str]
+    port: Optional[int]
+    path: str
+    params: str
+    query: str
+    fragment: str
+
+@lru_cache(maxsize=256)
+def parse_ldap_uri(uri: str) -> LdapURI:
+    """Parses an LDAP URI into an LdapURI tuple; results are memoized, so callers share them."""
+    parts = urlparse(uri)
+    if parts.scheme not in ('ldap', 'ldaps', 'ldapi'):
+        raise ValueError(f"Not an LDAP URI: {uri}")
+    return LdapURI(parts.scheme, parts.hostname, parts.port, parts.path,
+                   parts.params, parts.query, parts.fragment)
 
 def validate_search_filter(filter_str: str):
-    """Validates an LDAP search filter."""
-    # Placeholder implementation
-    # For now, assume all filters are valid
-    _ = filter_str # Mark as used
-    return True
+    """Checks an LDAP search filter is parenthesized and its parentheses balance."""
+    # Literal parentheses in values are escaped as \28 and \29, so every
+    # bare one is structural; a close before its open fails straight away
+    depth = 0
+    for ch in filter_str:
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth < 0:
+                return False
+    return depth == 0 and '(' in filter_str
 
 def parse_attributes(attributes_str: str | None):
-    """Parses a string of comma-separated attributes."""
+    """Parses a string of comma-separated attributes, dropping empty items."""
     if not attributes_str:
         return []
-    return [attr.strip() for attr in attributes_str.split(',')]
+    return [attr for attr in map(str.strip, attributes_str.split(',')) if attr]
 
 def create_connection(ldap_uri: str, bind_dn: str | None = None, password: str | None = None, sasl_mechanism: str | None = None):
     """Creates an LDAP connection."""
@@ -70,39 +89,34 @@ def handle_error_response(response, msg: str = "LDAP operation failed"):
 def parse_modification_attributes(add_attrs: list[str] | None, replace_attrs: list[str] | None, delete_attrs: list[str] | None) -> dict:
     """Parses modification attributes from command-line arguments."""
     mods = {}
-    if add_attrs:
-        for attr_val in add_attrs:
-            parts = attr_val.split('=', 1)
-            attr = parts[0]
-            val = parts[1] if len(parts) > 1 else ''
-            # ldap3 expects list of values for an attribute modification
-            current_mod = mods.get(attr, {'operation': ldap3.MODIFY_ADD, 'value': []})
-            current_mod['value'].append(val)
-            mods[attr] = current_mod
-    if replace_attrs:
-        for attr_val in replace_attrs:
-            parts = attr_val.split('=', 1)
-            attr = parts[0]
-            val = parts[1] if len(parts) > 1 else ''
-            mods[attr] = {'operation': ldap3.MODIFY_REPLACE, 'value': [val]}
-    if delete_attrs:
-        for attr_val in delete_attrs: # Assuming delete_attrs might contain attr=val or just attr
-            attr = attr_val.split('=', 1)[0]
-            # For delete, value can be specific or empty to delete all values
-            # Placeholder: simple delete of attribute itself or specific values if provided
-            if '=' in attr_val:
-                _, val = attr_val.split('=', 1)
-                mods[attr] = {'operation': ldap3.MODIFY_DELETE, 'value': [val]}
-            else:
-                mods[attr] = {'operation': ldap3.MODIFY_DELETE, 'value': []}
+    # partition() splits once without building a list; a bare attr gets an empty value
+    for attr_val in add_attrs or ():
+        attr, _, val = attr_val.partition('=')
+        # ldap3 expects list of values for an attribute modification
+        mod = mods.get(attr)
+        if mod is None:
+            mod = mods[attr] = {'operation': ldap3.MODIFY_ADD, 'value': []}
+        mod['value'].append(val)
+    for attr_val in replace_attrs or ():
+        attr, _, val = attr_val.partition('=')
+        mods[attr] = {'operation': ldap3.MODIFY_REPLACE, 'value': [val]}
+    for attr_val in delete_attrs or ():
+        # For delete, attr=val removes that value and a bare attr removes all values
+        attr, sep, val = attr_val.partition('=')
+        mods[attr] = {'operation': ldap3.MODIFY_DELETE, 'value': [val] if sep else []}
     return mods
 
+def split_args(arg: str) -> list[str]:
+    """Splits a command line, honouring quotes only when the line contains any."""
+    if '"' in arg or "'" in arg:
+        try:
+            return shlex.split(arg)
+        except ValueError:
+            pass
+    return arg.split()
+
 def format_output_filename(basename: str, extension: str) -> str:
-    """Formats an output filename, ensuring correct extension."""
+    """Formats an output filename, appending the extension unless it already ends with it."""
     if basename.endswith(f".{extension}"):
         return basename
-    # if basename contains a dot not at the end, and it's not the target extension, append target extension
-    if '.' in basename and not basename.endswith('.'):
-        return f"{basename}.{extension}"
-    # if no extension or ends with a dot, just append
     return f"{basename}.{extension}"
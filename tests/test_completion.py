@@ -12,10 +12,10 @@ from rich.console import Console
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 try:
-    from ldapie.tab_completion import TabCompletion, QueryHistory
+    from ldapie.tab_completion import TabCompletion, QueryHistory, LDAPCompleter
     from ldapie.shell_enhancements import enhance_shell
 except ImportError:
-    from src.ldapie.tab_completion import TabCompletion, QueryHistory
+    from src.ldapie.tab_completion import TabCompletion, QueryHistory, LDAPCompleter
     from src.ldapie.shell_enhancements import enhance_shell
 
 # Create a console for output
@@ -55,6 +55,32 @@ def test_tab_completion():
     console.print("[green]✓ Tab completion tests completed[/green]")
     console.print()
 
+def test_prompt_toolkit_completer():
+    """Test the prompt_toolkit completer adapter"""
+    console.print("[bold]Testing prompt_toolkit Completer[/bold]")
+    console.rule()
+    
+    try:
+        from prompt_toolkit.document import Document
+    except ImportError:
+        console.print("[yellow]prompt_toolkit not installed, skipping[/yellow]")
+        return
+    
+    completer = LDAPCompleter(TabCompletion(QueryHistory()))
+    
+    # Command names
+    completions = [c.text for c in completer.get_completions(Document("se"), None)]
+    console.print(f"Completions for 'se': {completions}")
+    assert completions == ["search"]
+    
+    # Command arguments are forwarded to the command-specific completer
+    completions = [c.text for c in completer.get_completions(Document("history "), None)]
+    console.print(f"Completions for 'history ': {completions}")
+    assert completions == ["search", "base", "host"]
+    
+    console.print("[green]✓ prompt_toolkit completer tests completed[/green]")
+    console.print()
+
 def test_query_history():
     """Test the query history functionality"""
     console.print("[bold]Testing Query History[/bold]")
@@ -91,6 +117,7 @@ if __name__ == "__main__":
     console.print()
     
     test_tab_completion()
+    test_prompt_toolkit_completer()
     test_query_history()
     
     console.print("\n[bold green]All tests completed successfully![/bold green]")
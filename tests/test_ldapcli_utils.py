@@ -25,13 +25,15 @@ from ldapie.utils import (
     handle_error_response,
     parse_modification_attributes, 
     format_output_filename,
+    split_args,
 )
 from ldapie.output import (
+    output_ldif,
     format_ldap_entry,
     # format_json, # Not directly tested, but used by format_ldap_entry
     # format_ldif, # Not directly tested, but used by format_ldap_entry
     format_entries_as_csv,
-    # convert_to_csv, # Not directly tested, but used by format_entries_as_csv
+    convert_to_csv,
 )
 from ldapie.entry_operations import (
     rename_entry,
@@ -40,7 +42,12 @@ from ldapie.entry_operations import (
     add_entry, 
     delete_entry, 
     modify_entry,
+    get_pool,
 )
+from ldapie.cache import LRUTTLCache
+from ldapie.search import iter_paged_search, PAGED_RESULTS_OID
+from ldapie import rich_formatter
+from ldapie.shell_enhancements import _first_arg
 # Removed problematic try/except for module imports as they are now clearly defined.
 
 class TestLdapUtils(unittest.TestCase):
@@ -101,11 +108,24 @@ class TestLdapUtils(unittest.TestCase):
         self.assertEqual(format_output_filename("test.", "json"), "test..json") # Edge case
 
     
+    def test_split_args(self):
+        """Test splitting shell arguments with and without quotes"""
+        self.assertEqual(split_args("(uid=*) cn mail"), ["(uid=*)", "cn", "mail"])
+        self.assertEqual(split_args('"(cn=John Doe)" cn'), ["(cn=John Doe)", "cn"])
+        # Unbalanced quotes fall back to whitespace splitting
+        self.assertEqual(split_args("(cn=O'Brien) cn"), ["(cn=O'Brien)", "cn"])
+        self.assertEqual(split_args(""), [])
+
+    
     def test_parse_ldap_uri(self):
         """Test parsing of LDAP URI into components"""
-        # Placeholder for parse_ldap_uri raises NotImplementedError
-        with self.assertRaises(NotImplementedError):
-            parse_ldap_uri("ldap://example.com:389")
+        uri = parse_ldap_uri("ldaps://example.com:636/dc=example,dc=com?cn")
+        self.assertEqual((uri.scheme, uri.hostname, uri.port), ("ldaps", "example.com", 636))
+        self.assertEqual((uri.path, uri.query), ("/dc=example,dc=com", "cn"))
+        self.assertIsNone(parse_ldap_uri("ldap://example.com").port)
+        self.assertIs(parse_ldap_uri("ldap://example.com"), parse_ldap_uri("ldap://example.com"))
+        with self.assertRaises(ValueError):
+            parse_ldap_uri("http://example.com")
     
     def test_format_ldap_entry(self):
         """Test formatting of LDAP entries for display"""
@@ -131,15 +151,18 @@ class TestLdapUtils(unittest.TestCase):
     
     def test_validate_search_filter(self): 
         """Test parsing and validation of LDAP search filters"""
-        # Current placeholder for validate_search_filter always returns True
         self.assertTrue(validate_search_filter("(cn=user)"))
-        self.assertTrue(validate_search_filter("(cn=user")) # Invalid, but placeholder returns True
+        self.assertTrue(validate_search_filter("(&(objectClass=person)(cn=a\\28b\\29))"))
+        self.assertFalse(validate_search_filter("(cn=user"))
+        self.assertFalse(validate_search_filter("())("))
+        self.assertFalse(validate_search_filter("cn=user"))
 
     def test_parse_attributes(self):
         """Test parsing of attribute list"""
         self.assertEqual(parse_attributes("cn"), ["cn"])
         self.assertEqual(parse_attributes("cn,sn,mail"), ["cn", "sn", "mail"])
         self.assertEqual(parse_attributes("cn, sn, mail"), ["cn", "sn", "mail"])
+        self.assertEqual(parse_attributes("cn,, mail,"), ["cn", "mail"])
         self.assertEqual(parse_attributes(None), [])
         self.assertEqual(parse_attributes(""), [])
     
@@ -171,6 +194,34 @@ class TestLdapUtils(unittest.TestCase):
         # Test with empty entries list
         self.assertEqual(format_entries_as_csv([]), "")
 
+    def test_convert_to_csv_file(self):
+        """Test CSV rows are written to a given file instead of returned"""
+        entries = [{"dn": "cn=user1,dc=example,dc=com", "mail": ["a@example.com", "b@example.com"]}]
+        out = StringIO()
+        self.assertIsNone(convert_to_csv(entries, file=out))
+        self.assertEqual(out.getvalue(), convert_to_csv(entries))
+        self.assertIn('a@example.com;b@example.com', out.getvalue())
+
+    def test_output_ldif(self):
+        """Test LDIF output base64-encodes values that are not safe strings"""
+        entry = MagicMock()
+        entry.entry_dn = "cn=test,dc=example,dc=com"
+        entry.entry_attributes_as_dict = {
+            "cn": ["test"],
+            "description": [" leading space", ":colon", "caf\u00e9"],
+            "jpegPhoto": [b"\x00\x01"],
+        }
+        output_ldif([entry])
+        self.assertEqual(self.stdout.getvalue(), (
+            "dn: cn=test,dc=example,dc=com\n"
+            "cn: test\n"
+            "description:: IGxlYWRpbmcgc3BhY2U=\n"
+            "description:: OmNvbG9u\n"
+            "description:: Y2Fmw6k=\n"
+            "jpegPhoto:: AAE=\n"
+            "\n"
+        ))
+
     def test_handle_error_response(self):
         """Test error response handling"""
         # Placeholder for handle_error_response raises RuntimeError
@@ -198,7 +249,7 @@ class TestLdapUtils(unittest.TestCase):
         self.assertIn("person", result_all_oc)
         
         result_person_oc = get_schema_info(self.mock_conn, "objectclass", "person")
-        self.assertEqual(result_person_oc.must_contain, ['cn', 'sn'])
+        self.assertEqual(result_person_oc.must_contain, ('cn', 'sn'))
 
         result_all_at = get_schema_info(self.mock_conn, "attributetypes")
         self.assertIn("cn", result_all_at)
@@ -222,6 +273,39 @@ class TestLdapUtils(unittest.TestCase):
             get_schema_info(self.mock_conn, "attributetype", "nonexistentattr")
 
 
+    def test_load_server_info(self):
+        """Test only the missing part of the server info is read"""
+        from ldapie.schema import load_server_info
+        server = MagicMock(info=None, schema=None, get_info=ldap3.NONE)
+        seen = []
+        server.get_info_from_server.side_effect = lambda conn: seen.append(server.get_info)
+        load_server_info(server, self.mock_conn, ldap3.DSA)
+        self.assertEqual(seen, [ldap3.DSA])
+        self.assertEqual(server.get_info, ldap3.NONE)
+
+        # Nothing is read once the server holds the requested part
+        server.info = MagicMock()
+        load_server_info(server, self.mock_conn, ldap3.DSA)
+        load_server_info(server, self.mock_conn)
+        self.assertEqual(seen, [ldap3.DSA, ldap3.SCHEMA])
+
+    def test_get_schema_info_cached(self):
+        """Test a schema definition is formatted once per server and failures are retried"""
+        from ldapie.schema import get_schema_info, schema_cache
+        server = ldap3.Server("schema-test", get_info=ldap3.OFFLINE_SLAPD_2_4)
+        conn = ldap3.Connection(server)
+        server.get_info_from_server(conn)
+        schema_cache.flush()
+        with patch("ldapie.schema.format_schema_output", return_value="cn") as fmt:
+            self.assertEqual(get_schema_info(conn, "attributes", "cn"), "cn")
+            self.assertEqual(get_schema_info(conn, "Attributes", "CN"), "cn")
+        self.assertEqual(fmt.call_count, 1)
+
+        # An unknown name is looked up again rather than answered from the cache
+        self.assertIn("not found", get_schema_info(conn, "attributes", "ldapieTest"))
+        self.assertEqual(len(schema_cache), 1)
+        schema_cache.flush()
+
     def test_add_entry(self):
         """Test adding a new LDAP entry"""
         self.mock_conn.add.return_value = True
@@ -265,49 +349,178 @@ class TestLdapUtils(unittest.TestCase):
         child_entry2 = MagicMock(spec=ldap3.Entry)
         child_entry2.entry_dn = child_entry2_dn
         
-        # Define a side effect for search to break recursion
-        # This function will be called each time self.mock_conn.search() is called
-        def search_side_effect(search_base, search_filter, search_scope, attributes, controls):
-            # Mark unused parameters to satisfy linters
+        grandchild_dn = f"cn=grandchild,{child_entry1_dn}"
+        grandchild_entry = MagicMock(spec=ldap3.Entry)
+        grandchild_entry.entry_dn = grandchild_dn
+        parent_entry = MagicMock(spec=ldap3.Entry)
+        parent_entry.entry_dn = parent_dn
+
+        # A single subtree search returns the whole tree, including the base entry
+        def search_side_effect(search_base, search_filter, **kwargs):
             _ = search_filter
-            _ = search_scope
-            _ = attributes
-            _ = controls
-            # Simulate search results based on the search_base
-            if search_base == parent_dn:
-                self.mock_conn.entries = [child_entry1, child_entry2]
-            elif search_base == child_entry1_dn:
-                self.mock_conn.entries = [] # child1 has no children
-            elif search_base == child_entry2_dn:
-                self.mock_conn.entries = [] # child2 has no children
-            else:
-                # Default for any other unexpected search base, to prevent errors
-                self.mock_conn.entries = [] 
-            return True # Indicate search operation itself was successful
+            _ = kwargs
+            self.mock_conn.entries = [parent_entry, child_entry1, grandchild_entry, child_entry2]
+            return True
 
         self.mock_conn.search.side_effect = search_side_effect
         
         result_recursive = delete_entry(self.mock_conn, parent_dn, recursive=True)
         self.assertTrue(result_recursive)
         
-        # Check that search was called for parent and then for each child
-        expected_search_calls = [
-            unittest.mock.call(search_base=parent_dn, search_filter='(objectClass=*)', search_scope=ldap3.LEVEL, attributes=['objectClass'], controls=None),
-            unittest.mock.call(search_base=child_entry1_dn, search_filter='(objectClass=*)', search_scope=ldap3.LEVEL, attributes=['objectClass'], controls=None),
-            unittest.mock.call(search_base=child_entry2_dn, search_filter='(objectClass=*)', search_scope=ldap3.LEVEL, attributes=['objectClass'], controls=None),
-        ]
-        self.mock_conn.search.assert_has_calls(expected_search_calls, any_order=True)
-        # Total search calls: 1 for parent, 1 for each of the 2 children = 3
-        self.assertEqual(self.mock_conn.search.call_count, 3)
-
-        # Check that delete was called for all entries (children first due to recursion depth, then parent)
-        actual_delete_calls = [
-            unittest.mock.call(child_entry1_dn, controls=None),
-            unittest.mock.call(child_entry2_dn, controls=None),
-            unittest.mock.call(parent_dn, controls=None)
-        ]
-        self.mock_conn.delete.assert_has_calls(actual_delete_calls, any_order=True)
-        self.assertEqual(self.mock_conn.delete.call_count, 3) # 1 for each child, 1 for parent
+        # One paged subtree search that asks for no attributes
+        self.assertEqual(self.mock_conn.search.call_count, 1)
+        _, search_kwargs = self.mock_conn.search.call_args
+        self.assertEqual(self.mock_conn.search.call_args[0][0], parent_dn)
+        self.assertEqual(search_kwargs['search_scope'], ldap3.SUBTREE)
+        self.assertEqual(search_kwargs['attributes'], ['1.1'])
+
+        # Deepest entries are deleted first and the base entry last
+        deleted_dns = [c.args[0] for c in self.mock_conn.delete.call_args_list]
+        self.assertEqual(deleted_dns[0], grandchild_dn)
+        self.assertEqual(set(deleted_dns[1:3]), {child_entry1_dn, child_entry2_dn})
+        self.assertEqual(deleted_dns[3], parent_dn)
+        self.assertEqual(self.mock_conn.delete.call_count, 4)
+
+        # The base entry is recognised even when spelled differently from the server's DN
+        self.mock_conn.delete.reset_mock()
+        spaced_dn = "cn=testuser, dc=example, dc=com"
+        self.assertTrue(delete_entry(self.mock_conn, spaced_dn, recursive=True))
+        deleted_dns = [c.args[0] for c in self.mock_conn.delete.call_args_list]
+        self.assertEqual(deleted_dns[3:], [spaced_dn])
+
+    def test_delete_max_depth_requires_recursive(self):
+        """Test the delete command rejects --max-depth without --recursive"""
+        from click.testing import CliRunner
+        from ldapie.ldapie import cli
+        result = CliRunner().invoke(cli, ["delete", "ldap.example.com", "ou=people,dc=example,dc=com",
+                                          "--max-depth", "1"])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--max-depth requires --recursive", result.output)
+
+    def test_delete_entry_server_side(self):
+        """Test recursive delete with the Tree Delete control and its fallback"""
+        parent_dn = "ou=people,dc=example,dc=com"
+        self.mock_conn.server = MagicMock(info=None)
+        self.mock_conn.delete.return_value = True
+
+        # Supported: one request deletes the whole subtree
+        self.assertTrue(delete_entry(self.mock_conn, parent_dn, recursive=True, server_side=True))
+        self.mock_conn.delete.assert_called_once_with(
+            parent_dn, controls=[('1.2.840.113556.1.4.805', True, None)])
+        self.mock_conn.search.assert_not_called()
+
+        # Unsupported: the server rejects the critical control, so the
+        # subtree is deleted entry by entry
+        self.mock_conn.reset_mock()
+        self.mock_conn.delete.side_effect = [False, True]
+        self.mock_conn.result = {'result': 12, 'description': 'unavailableCriticalExtension'}
+        self.mock_conn.entries = []
+        self.assertTrue(delete_entry(self.mock_conn, parent_dn, recursive=True, server_side=True))
+        self.assertEqual(self.mock_conn.search.call_count, 1)
+        self.mock_conn.delete.assert_called_with(parent_dn, controls=None)
+
+        # Unsupported according to the root DSE: no tree delete is attempted
+        self.mock_conn.reset_mock()
+        self.mock_conn.delete.side_effect = None
+        self.mock_conn.server.info = MagicMock(supported_controls=[
+            ('1.2.840.113556.1.4.319', 'CONTROL', 'LDAP Simple Paged Results', 'RFC2696')])
+        self.assertTrue(delete_entry(self.mock_conn, parent_dn, recursive=True, server_side=True))
+        self.mock_conn.delete.assert_called_once_with(parent_dn, controls=None)
+
+    def test_delete_entry_max_depth(self):
+        """Test a depth-limited recursive delete leaves deeper entries alone"""
+        parent_dn = "ou=people,dc=example,dc=com"
+        dns = [parent_dn, f"cn=a,{parent_dn}", f"cn=b,cn=a,{parent_dn}", f"cn=c,cn=b,cn=a,{parent_dn}"]
+        entries = []
+        for dn in dns:
+            entry = MagicMock(spec=ldap3.Entry)
+            entry.entry_dn = dn
+            entries.append(entry)
+
+        def search_side_effect(*args, **kwargs):
+            _ = args
+            self.mock_conn.entries = entries if kwargs['search_scope'] == ldap3.SUBTREE else entries[1:2]
+            return True
+        self.mock_conn.search.side_effect = search_side_effect
+        self.mock_conn.delete.return_value = True
+
+        delete_entry(self.mock_conn, parent_dn, recursive=True, max_depth=2)
+        deleted_dns = [c.args[0] for c in self.mock_conn.delete.call_args_list]
+        self.assertEqual(deleted_dns, [dns[2], dns[1], parent_dn])
+
+        # Direct children only need a one-level search
+        self.mock_conn.reset_mock()
+        delete_entry(self.mock_conn, parent_dn, recursive=True, max_depth=1)
+        self.assertEqual(self.mock_conn.search.call_args[1]['search_scope'], ldap3.LEVEL)
+        deleted_dns = [c.args[0] for c in self.mock_conn.delete.call_args_list]
+        self.assertEqual(deleted_dns, [dns[1], parent_dn])
+
+    def test_delete_entry_with_pool(self):
+        """Test a recursive delete pipelined through a connection pool"""
+        self.mock_conn.delete.return_value = True
+        parent_dn = "ou=people,dc=example,dc=com"
+        dns = [parent_dn, f"cn=a,{parent_dn}", f"cn=b,{parent_dn}", f"cn=c,cn=a,{parent_dn}"]
+        entries = []
+        for dn in dns:
+            entry = MagicMock(spec=ldap3.Entry)
+            entry.entry_dn = dn
+            entries.append(entry)
+
+        def search_side_effect(*args, **kwargs):
+            _ = args
+            _ = kwargs
+            self.mock_conn.entries = entries
+            return True
+        self.mock_conn.search.side_effect = search_side_effect
+
+        # The pool answers with message ids whose results arrive later
+        events = []
+        pool = MagicMock(spec=ldap3.Connection)
+        def pool_delete(dn, controls=None):
+            _ = controls
+            events.append(('delete', dn))
+            return dn
+        def pool_get_response(message_id):
+            events.append(('response', message_id))
+            return [], {'result': 0, 'description': 'success'}
+        pool.delete.side_effect = pool_delete
+        pool.strategy = MagicMock()
+        pool.strategy.get_response.side_effect = pool_get_response
+
+        self.assertTrue(delete_entry(self.mock_conn, parent_dn, recursive=True, pool=pool))
+
+        # Deeper levels complete before shallower ones are sent; one level is pipelined
+        self.assertEqual(events[:2], [('delete', dns[3]), ('response', dns[3])])
+        self.assertEqual({e[1] for e in events[2:4]}, {dns[1], dns[2]})
+        self.assertTrue(all(e[0] == 'delete' for e in events[2:4]))
+        self.assertTrue(all(e[0] == 'response' for e in events[4:6]))
+        # The base entry itself is deleted on the main connection
+        self.mock_conn.delete.assert_called_once_with(parent_dn, controls=None)
+
+        # A failed response aborts the delete
+        pool.strategy.get_response.side_effect = lambda message_id: ([], {'result': 66, 'description': 'notAllowedOnNonLeaf'})
+        with self.assertRaises(RuntimeError):
+            delete_entry(self.mock_conn, parent_dn, recursive=True, pool=pool)
+
+        # A pool factory is only called when there are descendants, and its pool is released
+        pool.strategy.get_response.side_effect = pool_get_response
+        pool.reset_mock()
+        factory = MagicMock(return_value=pool)
+        self.assertTrue(delete_entry(self.mock_conn, parent_dn, recursive=True, pool_factory=factory))
+        factory.assert_called_once_with()
+        pool.unbind.assert_called_once_with()
+        self.mock_conn.search.side_effect = None
+        self.mock_conn.entries = entries[:1]
+        factory.reset_mock()
+        self.assertTrue(delete_entry(self.mock_conn, parent_dn, recursive=True, pool_factory=factory))
+        factory.assert_not_called()
+
+    def test_get_pool_name(self):
+        """Test connection pools are named per server and bind DN"""
+        server_a, server_b = ldap3.Server('ldap-a.example.com'), ldap3.Server('ldap-b.example.com')
+        names = {get_pool(server, user).pool_name for server, user in [
+            (server_a, 'cn=admin'), (server_a, 'cn=reader'), (server_b, 'cn=admin')]}
+        self.assertEqual(len(names), 3)
 
 
     def test_modify_entry(self):
@@ -340,5 +553,185 @@ class TestLdapUtils(unittest.TestCase):
         with self.assertRaisesRegex(NotImplementedError, "rename_entry for .* is a placeholder and not fully implemented."):
             rename_entry(self.mock_conn, "cn=oldname,dc=example,dc=com", "cn=newname")
 
+    def test_iter_paged_search_limit(self):
+        """Test a limited paged search only asks for the entries still wanted"""
+        sizes = []
+
+        def search(base, flt, search_scope, attributes, paged_size, paged_cookie):
+            sizes.append(paged_size)
+            self.mock_conn.entries = [MagicMock() for _ in range(paged_size)]
+            self.mock_conn.result = {"controls": {PAGED_RESULTS_OID: {"value": {"cookie": b"more"}}}}
+
+        self.mock_conn.search.side_effect = search
+        entries = list(iter_paged_search(self.mock_conn, "dc=example,dc=com", "(objectClass=*)",
+                                         ldap3.SUBTREE, ["cn"], 100, limit=250))
+        self.assertEqual(len(entries), 250)
+        self.assertEqual(sizes, [100, 100, 50])
+
+        # The next page is only requested once the caller is done with this one
+        pages = iter_paged_search(self.mock_conn, "dc=example,dc=com", "(objectClass=*)",
+                                  ldap3.SUBTREE, ["cn"], 100)
+        next(pages)
+        self.assertEqual(len(sizes), 4)
+
+    def test_first_arg(self):
+        """Test the search history takes the first argument as shlex would"""
+        self.assertEqual(_first_arg("(uid=jdoe) cn mail"), "(uid=jdoe)")
+        self.assertEqual(_first_arg("'(cn=John Smith)' cn"), "(cn=John Smith)")
+        self.assertEqual(_first_arg('(cn="John Smith") cn'), "(cn=John Smith)")
+        self.assertEqual(_first_arg("\"it's\" cn"), "it's")
+        self.assertIsNone(_first_arg("   "))
+
+        # Only one quote pair is removed from the recorded filter
+        from types import SimpleNamespace
+        from ldapie.shell_enhancements import enhance_do_search
+        shell = SimpleNamespace(do_search=MagicMock(), query_history=MagicMock())
+        enhance_do_search(shell).do_search("'\"(cn=a b)\"' cn")
+        shell.query_history.add_search.assert_called_once_with('"(cn=a b)"')
+
+    def test_keyring_errors(self):
+        """Test a keyring without a usable backend neither blocks the bind nor its lookup"""
+        from types import SimpleNamespace
+        from ldapie import ldapie as cli_module
+
+        class KeyringError(Exception):
+            pass
+
+        def fail(*args):
+            raise KeyringError("No recommended backend was available")
+
+        keyring = SimpleNamespace(errors=SimpleNamespace(KeyringError=KeyringError),
+                                  get_password=fail, set_password=fail)
+        with patch.object(cli_module, "_import_keyring", return_value=keyring), \
+             patch.object(cli_module, "_keyring_enabled", return_value=True), \
+             patch.dict(cli_module._PASSWORD_CACHE, clear=True), \
+             patch.dict(cli_module._CONNECTION_CACHE, clear=True), \
+             patch.dict(cli_module._SERVER_CACHE, clear=True), \
+             patch("sys.stdin", StringIO("secret\n")), \
+             patch("ldap3.Connection") as connection:
+            # The lookup falls back to reading the password from stdin
+            self.assertEqual(cli_module.read_password("ldap.example.com", "cn=admin", True), "secret")
+
+            # A failed store after a successful bind only warns
+            connection.return_value.bound = True
+            connection.return_value.socket = None
+            config = cli_module.LdapConfig("ldap.example.com", "cn=admin", "secret")
+            _, conn = config.get_connection()
+            self.assertIs(conn, connection.return_value)
+            self.assertEqual(cli_module._PASSWORD_CACHE[("ldap.example.com", "cn=admin")], "secret")
+
+    def test_shell_search_help_context(self):
+        """Test the help context gets every entry of a multi-page shell search"""
+        from rich.console import Console
+        from ldapie.interactive import LDAPShell, help_available
+        from ldapie.search import search_cache
+        if not help_available:
+            self.skipTest("help context not available")
+
+        pages = [[MagicMock(), MagicMock()], [MagicMock()]]
+        results = iter(pages)
+
+        def search(base, flt, search_scope, attributes, paged_size, paged_cookie):
+            page = next(results)
+            self.mock_conn.entries = page
+            cookie = b"more" if page is pages[0] else b""
+            self.mock_conn.result = {"controls": {PAGED_RESULTS_OID: {"value": {"cookie": cookie}}}}
+
+        self.mock_conn.search.side_effect = search
+        self.mock_conn.bound = True
+        self.mock_conn.server = MagicMock(name="ldap://example.com")
+        self.mock_conn.user = None
+        search_cache.flush()
+        with patch("ldapie.interactive.render_entries", return_value=""):
+            shell = LDAPShell(None, self.mock_conn, Console(file=StringIO()), "dc=example,dc=com")
+            shell.do_search("(objectClass=*) cn --page 2")
+            self.assertEqual(shell.help_context.current_context["search_results"], pages[0] + pages[1])
+
+            # A repeat with --cached is answered from the cache, says so, and
+            # still reports its own entries
+            self.mock_conn.entries = []
+            shell.do_search("(objectClass=*) cn --page 2 --cached")
+            self.assertEqual(self.mock_conn.search.call_count, 2)
+            self.assertIn("(cached)", shell.console.file.getvalue())
+            self.assertEqual(shell.help_context.current_context["search_results"], pages[0] + pages[1])
+
+            # Without --cached every search goes to the server
+            results = iter(pages)
+            shell.do_search("(objectClass=*) cn --page 2")
+            self.assertEqual(self.mock_conn.search.call_count, 4)
+        search_cache.flush()
+
+    def test_lru_ttl_cache(self):
+        """Test expiry, eviction and DN invalidation of the search cache"""
+        with patch("ldapie.cache.time.monotonic", return_value=100.0) as clock:
+            cache = LRUTTLCache(maxsize=2, ttl=10)
+            cache.put(("ou=people,dc=example,dc=com", "(uid=a)"), ["a"])
+            cache.put(("ou=groups,dc=example,dc=com", "(cn=b)"), ["b"])
+            self.assertEqual(cache.get(("ou=people,dc=example,dc=com", "(uid=a)")), ["a"])
+
+            # The least recently used entry is evicted first
+            cache.put(("dc=example,dc=com", "(cn=c)"), ["c"])
+            self.assertIsNone(cache.get(("ou=groups,dc=example,dc=com", "(cn=b)")))
+            self.assertEqual(len(cache), 2)
+
+            # A write invalidates searches at, above or below the DN only
+            cache.put(("ou=groups,dc=example,dc=com", "(cn=b)"), ["b"])
+            cache.flush("uid=a,ou=people,dc=example,dc=com")
+            self.assertIsNone(cache.get(("dc=example,dc=com", "(cn=c)")))
+            self.assertEqual(cache.get(("ou=groups,dc=example,dc=com", "(cn=b)")), ["b"])
+
+            # Entries expire after the TTL
+            clock.return_value = 111.0
+            self.assertIsNone(cache.get(("ou=groups,dc=example,dc=com", "(cn=b)")))
+            self.assertEqual(len(cache), 0)
+
+    def test_cached_results_are_copies(self):
+        """Test changing a cached call's result does not change the cache"""
+        from ldapie.cache import cached
+        cache = LRUTTLCache()
+        calls = []
+
+        @cached(cache, key=lambda base: (base,))
+        def find(base):
+            calls.append(base)
+            return ["b", "a"]
+
+        find("dc=example,dc=com").append("c")
+        entries = find("dc=example,dc=com")
+        entries.sort()
+        self.assertEqual(find("dc=example,dc=com"), ["b", "a"])
+        self.assertEqual(calls, ["dc=example,dc=com"])
+
+    def test_rich_help_cached(self):
+        """Test a command's rich help is rendered once and then replayed on a terminal"""
+        import click
+        from click.testing import CliRunner
+
+        @click.command()
+        @rich_formatter.add_rich_help_option
+        @click.option("--limit", type=int, help="Maximum number of entries to return")
+        def sample(limit):
+            """Sample command."""
+
+        from rich.console import Console
+        from ldapie.ldapie import THEMES
+        
+        runner = CliRunner()
+        terminal = Console(file=StringIO(), force_terminal=True, theme=THEMES["dark"])
+        with patch.object(rich_formatter, "_console", terminal), \
+             patch.object(rich_formatter, "_render_help", wraps=rich_formatter._render_help) as render:
+            runner.invoke(sample, ["--help"])
+            first = terminal.file.getvalue()
+            runner.invoke(sample, ["--help"])
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(terminal.file.getvalue(), first * 2)
+        self.assertIn("--limit", first)
+
+        # Without a terminal, click's plain help is printed instead
+        piped = Console(file=StringIO(), force_terminal=False)
+        with patch.object(rich_formatter, "_console", piped):
+            runner.invoke(sample, ["--help"])
+        self.assertIn("Usage: sample [OPTIONS]", piped.file.getvalue())
+
 if __name__ == "__main__":
     unittest.main()